@@ -0,0 +1,67 @@
+'''
+    Compares the priority queues available to dijkstra_heap
+    and prim_heap on random graphs:
+
+        python bench_heaps.py [V] [E]
+
+    Prints the best of three wall times for each queue.
+'''
+
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "ShortestPath"))
+sys.path.insert(0, os.path.join(ROOT, "MST"))
+
+from dijkstra import dijkstra_heap  # noqa: E402
+from heaps import BinaryHeap, PairingHeap, RadixHeap  # noqa: E402
+from prim import prim_heap  # noqa: E402
+
+
+def random_graph(V, E, seed=0, max_weight=100):
+    '''Random undirected graph with integer weights,
+    stored with both directions of every edge.'''
+    rnd = random.Random(seed)
+    G = {v: [] for v in range(V)}
+    weights = {}
+    while len(weights) < 2 * E:
+        u, v = rnd.randrange(V), rnd.randrange(V)
+        if u == v or (u, v) in weights:
+            continue
+        w = rnd.randint(1, max_weight)
+        G[u].append(v)
+        G[v].append(u)
+        weights[(u, v)] = weights[(v, u)] = w
+    return G, weights
+
+
+def best_of(f, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(V=20000, E=200000):
+    G, weights = random_graph(V, E)
+    print("V = %d, E = %d" % (V, 2 * E))
+    for name, queue in [("heapq (lazy)", None),
+                        ("BinaryHeap", BinaryHeap),
+                        ("PairingHeap", PairingHeap),
+                        ("RadixHeap", RadixHeap)]:
+        t = best_of(lambda: dijkstra_heap(G, weights, 0, queue=queue))
+        print("dijkstra_heap  %-14s %8.3f s" % (name, t))
+    for name, queue in [("heapq (lazy)", None),
+                        ("BinaryHeap", BinaryHeap),
+                        ("PairingHeap", PairingHeap)]:
+        t = best_of(lambda: prim_heap(G, weights, queue=queue))
+        print("prim_heap      %-14s %8.3f s" % (name, t))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,42 @@
+'''
+    Compares the minimal spanning tree engines on a random
+    undirected graph:
+
+        python bench_mst.py [V] [E] [processes]
+
+    Prints the best of three wall times for each engine, and
+    checks that they all find a tree of the same weight.
+'''
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "MST"))
+
+from bench_heaps import best_of, random_graph  # noqa: E402
+from boruvka import boruvka  # noqa: E402
+from filter_kruskal import filter_kruskal  # noqa: E402
+from kruskal import kruskal  # noqa: E402
+from prim import prim, prim_heap  # noqa: E402
+
+
+def main(V=2000, E=100000, processes=None):
+    G, weights = random_graph(V, E)
+    print("V = %d, E = %d" % (V, E))
+    total = None
+    for name, f in [("kruskal", lambda: kruskal(G, weights)),
+                    ("prim", lambda: prim(G, weights)),
+                    ("prim_heap", lambda: prim_heap(G, weights)),
+                    ("filter_kruskal", lambda: filter_kruskal(G, weights)),
+                    ("boruvka", lambda: boruvka(G, weights, processes))]:
+        edges = f()
+        weight = sum(weights[e] for e in edges)
+        if total is None:
+            total = weight
+        assert weight == total, name
+        print("%-15s %8.3f s" % (name, best_of(f)))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,214 @@
+'''
+    Times the main algorithms of every directory over sweeps of
+    input sizes, on the seeded inputs of generators.py:
+
+        python bench_suite.py [--scale S] [--repeat R] [--only NAMES]
+                              [--out FILE] [--compare OLD] [--threshold T]
+
+    For every case and size it records the best of R wall times
+    and the peak memory allocated during one more run (with
+    tracemalloc, which is not running while timing).  The
+    scaling exponent of a case is the least squares slope of
+    log(time) against log(size), so about 1 for linear, 2 for
+    quadratic algorithms.  The results are written as JSON.
+
+    --scale multiplies all the sizes, --only keeps the cases
+    whose name contains one of the comma separated NAMES.
+    --compare reads the JSON of an earlier run and reports every
+    case and size whose time grew by more than the factor
+    --threshold (exit status 1 if there is one).
+'''
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("ShortestPath", "MST", "TopSort", "TreeCenter"):
+    sys.path.insert(0, os.path.join(ROOT, directory))
+
+import dfs_top_sort  # noqa: E402
+import generators as gen  # noqa: E402
+import kahn_top_sort_bottom_up  # noqa: E402
+import kahn_top_sort_top_down  # noqa: E402
+from arbitrage import arbitrage  # noqa: E402
+from bellman_ford import bellman_ford  # noqa: E402
+from bench_heaps import best_of  # noqa: E402
+from dijkstra import dijkstra, dijkstra_heap  # noqa: E402
+from kosaraju import kosaraju  # noqa: E402
+from kruskal import kruskal  # noqa: E402
+from prim import prim, prim_heap  # noqa: E402
+from treeCenter import get_centers, getCenters  # noqa: E402
+
+
+def _road(n):
+    side = max(2, math.isqrt(n))
+    return gen.road_graph(side, side)
+
+
+# (name, sizes, input for size n, function of the input).
+CASES = [
+    ("dijkstra", (250, 500, 1000, 2000),
+     lambda n: gen.sparse_digraph(n, 4 * n),
+     lambda G, w: dijkstra(G, w, 0)),
+    ("dijkstra dense", (100, 200, 400, 800),
+     lambda n: gen.dense_digraph(n),
+     lambda G, w: dijkstra(G, w, 0)),
+    ("dijkstra_heap", (5000, 10000, 20000, 40000),
+     lambda n: gen.sparse_digraph(n, 4 * n),
+     lambda G, w: dijkstra_heap(G, w, 0)),
+    ("dijkstra_heap grid", (2500, 10000, 40000),
+     lambda n: gen.grid_graph(math.isqrt(n), math.isqrt(n)),
+     lambda G, w: dijkstra_heap(G, w, 0)),
+    ("dijkstra_heap road", (2500, 10000, 40000),
+     _road,
+     lambda G, w: dijkstra_heap(G, w, 0)),
+    ("dijkstra_heap power law", (5000, 10000, 20000, 40000),
+     lambda n: gen.power_law_graph(n),
+     lambda G, w: dijkstra_heap(G, w, 0)),
+    ("bellman_ford", (125, 250, 500, 1000),
+     lambda n: gen.sparse_digraph(n, 4 * n),
+     lambda G, w: bellman_ford(G, w, 0)),
+    ("arbitrage", (15, 30, 60, 120),
+     lambda n: (gen.currency_matrix(n),),
+     arbitrage),
+    ("prim", (250, 500, 1000, 2000),
+     lambda n: gen.random_graph(n, 4 * n),
+     prim),
+    ("prim_heap", (5000, 10000, 20000, 40000),
+     lambda n: gen.random_graph(n, 4 * n),
+     prim_heap),
+    ("prim_heap dense", (100, 200, 400),
+     lambda n: gen.random_graph(n, n * (n - 1) // 4),
+     prim_heap),
+    ("kruskal", (5000, 10000, 20000, 40000),
+     lambda n: gen.random_graph(n, 4 * n),
+     kruskal),
+    ("kosaraju", (10000, 20000, 40000, 80000),
+     lambda n: (gen.sparse_digraph(n, 4 * n)[0],),
+     kosaraju),
+    ("top_sort kahn bottom up", (10000, 20000, 40000, 80000),
+     lambda n: (gen.dag(n, 4 * n),),
+     kahn_top_sort_bottom_up.top_sort),
+    ("top_sort kahn top down", (10000, 20000, 40000, 80000),
+     lambda n: (gen.dag(n, 4 * n),),
+     kahn_top_sort_top_down.top_sort),
+    ("top_sort dfs", (10000, 20000, 40000, 80000),
+     lambda n: (gen.dag(n, 4 * n),),
+     dfs_top_sort.top_sort),
+    ("getCenters", (20000, 40000, 80000, 160000),
+     gen.random_tree,
+     getCenters),
+    ("get_centers", (20000, 40000, 80000, 160000),
+     gen.random_tree,
+     get_centers),
+]
+
+
+def peak_memory(f):
+    '''Bytes allocated at the peak of one call of f, above
+    what was allocated before it.'''
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        f()
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+
+def exponent(sizes, seconds):
+    '''Least squares slope of log(seconds) against log(sizes).'''
+    if len(sizes) < 2:
+        return None
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in seconds]
+    mx = sum(xs) / len(xs)
+    my = sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx
+
+
+def run(cases, scale=1.0, repeat=3, log=sys.stderr):
+    results = {}
+    for name, sizes, make, f in cases:
+        sizes = sorted({max(2, int(n * scale)) for n in sizes})
+        seconds = []
+        peaks = []
+        for n in sizes:
+            args = make(n)
+            seconds.append(best_of(lambda: f(*args), repeat))
+            peaks.append(peak_memory(lambda: f(*args)))
+            print("%-26s n = %-8d %9.4f s %12d B"
+                  % (name, n, seconds[-1], peaks[-1]), file=log)
+        results[name] = {"sizes": sizes,
+                         "seconds": seconds,
+                         "peak_bytes": peaks,
+                         "exponent": exponent(sizes, seconds)}
+    return results
+
+
+def compare(old, new, threshold=1.2):
+    '''Returns the list of (name, size, old seconds, new
+    seconds) where the time grew by more than threshold.'''
+    regressions = []
+    for name, res in new["results"].items():
+        if name not in old["results"]:
+            continue
+        before = dict(zip(old["results"][name]["sizes"],
+                          old["results"][name]["seconds"]))
+        for n, t in zip(res["sizes"], res["seconds"]):
+            if n in before and t > threshold * before[n]:
+                regressions.append((name, n, before[n], t))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default="")
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    cases = CASES
+    if args.only:
+        names = args.only.split(",")
+        cases = [c for c in CASES if any(s in c[0] for s in names)]
+
+    report = {"python": platform.python_version(),
+              "implementation": platform.python_implementation(),
+              "machine": platform.machine(),
+              "scale": args.scale,
+              "repeat": args.repeat,
+              "results": run(cases, args.scale, args.repeat)}
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        regressions = compare(old, report, args.threshold)
+        for name, n, before, after in regressions:
+            print("REGRESSION %-26s n = %-8d %9.4f s -> %9.4f s"
+                  % (name, n, before, after), file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+'''
+    Seeded generators of benchmark inputs, in the formats the
+    algorithms take:
+
+    - digraphs and undirected graphs as (G, weights), with G a
+      dictionary of adjacency lists and weights a dictionary of
+      integer edge weights (undirected graphs store both
+      directions of every edge, as kruskal.py and prim.py want);
+    - DAGs as a dictionary of adjacency lists;
+    - trees as (N, edges), as in treeCenter.py;
+    - currency matrices as lists of lists of exchange rates.
+
+    The same arguments (including the seed) always give the
+    same input.
+'''
+
+import math
+import random
+
+import bench_heaps
+
+# Random undirected graph with E edges, both directions stored.
+random_graph = bench_heaps.random_graph
+
+
+def sparse_digraph(V, E, seed=0, max_weight=100):
+    '''Random digraph with E >= V edges (no loops or parallel
+    edges).  V of them form a random cycle through all the
+    vertices, so every vertex reaches every other.'''
+    rnd = random.Random(seed)
+    G = {v: [] for v in range(V)}
+    weights = {}
+    cycle = list(range(V))
+    rnd.shuffle(cycle)
+    for u, v in zip(cycle, cycle[1:] + cycle[:1]):
+        if u != v:
+            G[u].append(v)
+            weights[(u, v)] = rnd.randint(1, max_weight)
+    while len(weights) < E:
+        u, v = rnd.randrange(V), rnd.randrange(V)
+        if u == v or (u, v) in weights:
+            continue
+        G[u].append(v)
+        weights[(u, v)] = rnd.randint(1, max_weight)
+    return G, weights
+
+
+def dense_digraph(V, p=0.5, seed=0, max_weight=100):
+    '''Random digraph with every edge present with probability p.'''
+    rnd = random.Random(seed)
+    G = {v: [] for v in range(V)}
+    weights = {}
+    for u in range(V):
+        for v in range(V):
+            if u != v and rnd.random() < p:
+                G[u].append(v)
+                weights[(u, v)] = rnd.randint(1, max_weight)
+    return G, weights
+
+
+def dag(V, E, seed=0):
+    '''Random DAG with E edges: the edges go forward in a
+    random order of the vertices.'''
+    rnd = random.Random(seed)
+    order = list(range(V))
+    rnd.shuffle(order)
+    G = {v: [] for v in range(V)}
+    seen = set()
+    while len(seen) < E:
+        i, j = rnd.randrange(V), rnd.randrange(V)
+        if i == j:
+            continue
+        u, v = order[min(i, j)], order[max(i, j)]
+        if (u, v) not in seen:
+            seen.add((u, v))
+            G[u].append(v)
+    return G
+
+
+def grid_graph(rows, cols, seed=0, max_weight=100):
+    '''Undirected rows x cols grid with random weights.'''
+    rnd = random.Random(seed)
+    G = {v: [] for v in range(rows * cols)}
+    weights = {}
+    for r in range(rows):
+        for c in range(cols):
+            u = r * cols + c
+            for v in ([u + 1] if c + 1 < cols else []) + \
+                     ([u + cols] if r + 1 < rows else []):
+                w = rnd.randint(1, max_weight)
+                G[u].append(v)
+                G[v].append(u)
+                weights[(u, v)] = weights[(v, u)] = w
+    return G, weights
+
+
+def road_graph(rows, cols, seed=0, drop=0.1):
+    '''Road-like undirected graph: a grid of jittered points
+    with a fraction drop of the grid edges removed, some
+    diagonals added, and weights the Euclidean lengths (in
+    thousandths).'''
+    rnd = random.Random(seed)
+    points = [(r + rnd.uniform(-0.3, 0.3), c + rnd.uniform(-0.3, 0.3))
+              for r in range(rows) for c in range(cols)]
+    G = {v: [] for v in range(rows * cols)}
+    weights = {}
+    for r in range(rows):
+        for c in range(cols):
+            u = r * cols + c
+            candidates = []
+            if c + 1 < cols:
+                candidates.append(u + 1)
+            if r + 1 < rows:
+                candidates.append(u + cols)
+                if c + 1 < cols and rnd.random() < 0.2:
+                    candidates.append(u + cols + 1)
+            for v in candidates:
+                if rnd.random() < drop:
+                    continue
+                w = int(1000 * math.dist(points[u], points[v])) + 1
+                G[u].append(v)
+                G[v].append(u)
+                weights[(u, v)] = weights[(v, u)] = w
+    return G, weights
+
+
+def power_law_graph(V, m=3, seed=0, max_weight=100):
+    '''Undirected Barabasi-Albert graph: each new vertex is
+    joined to m existing vertices chosen with probability
+    proportional to their degree.'''
+    rnd = random.Random(seed)
+    G = {v: [] for v in range(V)}
+    weights = {}
+    # Every vertex appears here once per edge end.
+    ends = list(range(min(m, V)))
+    for u in range(m, V):
+        targets = set()
+        while len(targets) < m:
+            targets.add(rnd.choice(ends))
+        for v in targets:
+            w = rnd.randint(1, max_weight)
+            G[u].append(v)
+            G[v].append(u)
+            weights[(u, v)] = weights[(v, u)] = w
+            ends.extend((u, v))
+    return G, weights
+
+
+def random_tree(N, seed=0):
+    '''Random tree on 0, ..., N - 1 as (N, edges): vertex i
+    is attached to a random earlier vertex, and the labels
+    are shuffled.'''
+    rnd = random.Random(seed)
+    labels = list(range(N))
+    rnd.shuffle(labels)
+    edges = [[labels[rnd.randrange(i)], labels[i]] for i in range(1, N)]
+    rnd.shuffle(edges)
+    return N, edges
+
+
+def currency_matrix(n, seed=0, noise=0.01):
+    '''Exchange rates R[i][j] = p[j] / p[i] for random prices
+    p, each perturbed by a factor within 1 +- noise (so small
+    arbitrage cycles may exist).'''
+    rnd = random.Random(seed)
+    p = [rnd.uniform(0.1, 10) for _ in range(n)]
+    return [[1.0 if i == j else
+             p[j] / p[i] * (1 + rnd.uniform(-noise, noise))
+             for j in range(n)] for i in range(n)]
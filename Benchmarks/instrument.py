@@ -0,0 +1,96 @@
+'''
+    Operation counts of the main algorithms, on the seeded
+    inputs of generators.py:
+
+        python instrument.py [--scale S] [--only NAMES]
+
+    The counters, and the Stats class that collects them, are
+    described in stats.py.
+'''
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("ShortestPath", "MST", "TopSort"):
+    sys.path.insert(0, os.path.join(ROOT, directory))
+
+import dfs_top_sort  # noqa: E402
+import generators as gen  # noqa: E402
+from bellman_ford import (bellman_ford, bellman_ford_early_exit,  # noqa: E402
+                          bellman_ford_yen, spfa)
+from dijkstra import dijkstra_heap  # noqa: E402
+from heaps import BinaryHeap  # noqa: E402
+from kosaraju import kosaraju  # noqa: E402
+from kruskal import kruskal  # noqa: E402
+from prim import prim_heap  # noqa: E402
+from stats import Stats  # noqa: E402
+
+# (name, size, input for size n, function of the input and stats).
+CASES = [
+    ("dijkstra_heap", 20000,
+     lambda n: gen.sparse_digraph(n, 4 * n),
+     lambda G, w, stats: dijkstra_heap(G, w, 0, stats=stats)),
+    ("dijkstra_heap BinaryHeap", 20000,
+     lambda n: gen.sparse_digraph(n, 4 * n),
+     lambda G, w, stats: dijkstra_heap(G, w, 0, BinaryHeap, stats)),
+    ("bellman_ford", 500,
+     lambda n: gen.sparse_digraph(n, 4 * n),
+     lambda G, w, stats: bellman_ford(G, w, 0, stats)),
+    ("bellman_ford_early_exit", 500,
+     lambda n: gen.sparse_digraph(n, 4 * n),
+     lambda G, w, stats: bellman_ford_early_exit(G, w, 0, stats)),
+    ("bellman_ford_yen", 500,
+     lambda n: gen.sparse_digraph(n, 4 * n),
+     lambda G, w, stats: bellman_ford_yen(G, w, 0, stats)),
+    ("spfa", 500,
+     lambda n: gen.sparse_digraph(n, 4 * n),
+     lambda G, w, stats: spfa(G, w, 0, stats)),
+    ("prim_heap", 20000,
+     lambda n: gen.random_graph(n, 4 * n),
+     lambda G, w, stats: prim_heap(G, w, stats=stats)),
+    ("kruskal", 20000,
+     lambda n: gen.random_graph(n, 4 * n),
+     kruskal),
+    ("kosaraju", 40000,
+     lambda n: (gen.sparse_digraph(n, 4 * n)[0],),
+     kosaraju),
+    ("top_sort dfs", 40000,
+     lambda n: (gen.dag(n, 4 * n),),
+     dfs_top_sort.top_sort),
+]
+
+
+def run(cases, scale=1.0, log=sys.stdout):
+    results = {}
+    for name, n, make, f in cases:
+        n = max(2, int(n * scale))
+        args = make(n)
+        stats = Stats()
+        f(*args, stats)
+        results[name] = stats
+        print("%s (n = %d)" % (name, n), file=log)
+        for key, value in sorted(stats.counts().items()):
+            print("    %-24s %12d" % (key, value), file=log)
+        for phase, seconds in stats.phases().items():
+            print("    %-24s %12.4f s" % (phase, seconds), file=log)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--only", default="")
+    args = parser.parse_args(argv)
+
+    cases = CASES
+    if args.only:
+        names = args.only.split(",")
+        cases = [c for c in CASES if any(s in c[0] for s in names)]
+    run(cases, args.scale)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
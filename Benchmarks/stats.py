@@ -0,0 +1,88 @@
+'''
+    Operation counters for the instrumented algorithms.  Only
+    the standard library is used, so a caller can import this
+    module without the benchmarks or the algorithms.
+
+    The heap-based Dijkstra and Prim, the Bellman-Ford
+    variants, Kruskal (and ArrayUnionFind), Kosaraju and the
+    DFS topological sort take an optional stats argument: any
+    mapping whose missing entries count as 0, such as a
+    collections.Counter, or Stats below.  They add to it
+
+    - relaxations, improvements: edges looked at, and those
+      that lowered a distance or a key;
+    - heap_pushes, heap_pops, stale_pops, decrease_keys;
+    - queue_pops (spfa);
+    - bellman_ford_passes, bellman_ford_converged: passes made,
+      and passes until one changes nothing;
+    - finds, compression_steps (ArrayUnionFind);
+    - dfs_vertices, dfs_max_depth (dfs_engine.dfs, the largest
+      number of vertices on the stack at once);
+    - "time <phase>": seconds spent in a phase of kruskal
+      ("sort", "scan") or kosaraju ("index", "first pass",
+      "reverse", "second pass").
+
+    The counts are kept in local variables and added once at
+    the end of a call, so without stats the functions run as
+    fast as before.
+'''
+
+import collections
+import contextlib
+import time
+
+PHASE = "time "
+
+
+class Stats(collections.Counter):
+    '''A Counter that also calls its hooks with (phase,
+    seconds) whenever a phase time is added, and can time
+    blocks of the caller's own code with phase.
+
+    >>> seen = []
+    >>> stats = Stats(hooks=[lambda phase, t: seen.append((phase, t))])
+    >>> stats["time sort"] += 0.5
+    >>> stats["finds"] += 3
+    >>> with stats.phase("load"):
+    ...     pass
+    >>> seen[0], seen[1][0], stats["finds"]
+    (('sort', 0.5), 'load', 3)
+    >>> sorted(stats.phases()), stats.counts()
+    (['load', 'sort'], {'finds': 3})
+    '''
+
+    def __init__(self, *args, hooks=(), **kwargs):
+        self.hooks = list(hooks)
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        if self.hooks and isinstance(key, str) and key.startswith(PHASE):
+            seconds = value - self[key]
+            for hook in self.hooks:
+                hook(key[len(PHASE):], seconds)
+        super().__setitem__(key, value)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        '''Adds the time spent in the with block to the
+        phase name.'''
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self[PHASE + name] += time.perf_counter() - start
+
+    def phases(self):
+        '''Returns {phase: seconds}.'''
+        return {key[len(PHASE):]: value for key, value in self.items()
+                if isinstance(key, str) and key.startswith(PHASE)}
+
+    def counts(self):
+        '''Returns the entries that are not phase times.'''
+        return {key: value for key, value in self.items()
+                if not (isinstance(key, str) and key.startswith(PHASE))}
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -1,3 +1,6 @@
+from array import array
+
+
 class UnionFind:
 
     def __init__(self, keys):
@@ -12,3 +15,114 @@ class UnionFind:
         ux = self.find(x)
         uy = self.find(y)
         self.uf[ux] = self.uf[uy]
+
+
+# Union-find over the integers 0, ..., n - 1 stored in flat
+# arrays, with union by size and path halving, so every
+# operation is iterative and takes O(alpha(n)) amortized time.
+# O(n) space: two machine integers per element.
+#
+# If stats is given (a collections.Counter, say) every find,
+# and every step of path halving, is counted in it (see
+# Benchmarks/stats.py).  The counting find then replaces find on the instance,
+# so without stats nothing is added to the uncounted one.
+# find_many and union_many are not counted.
+class ArrayUnionFind:
+
+    def __init__(self, n, stats=None):
+        self.parent = array('l', range(n))
+        self.size = array('l', [1]) * n
+        self.count = n  # Number of components.
+        if stats is not None:
+            self.stats = stats
+            self.find = self._counted_find
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add(self):
+        '''Adds a new singleton element and returns it.'''
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        self.count += 1
+        return len(self.parent) - 1
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            # Path halving: point x at its grandparent.
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def _counted_find(self, x):
+        parent = self.parent
+        steps = 0
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+            steps += 1
+        stats = self.stats
+        stats["finds"] += 1
+        stats["compression_steps"] += steps
+        return x
+
+    def union(self, x, y):
+        '''Merges the components of x and y.  Returns False
+        if they were already the same component.'''
+        ux = self.find(x)
+        uy = self.find(y)
+        if ux == uy:
+            return False
+        size = self.size
+        if size[ux] < size[uy]:
+            ux, uy = uy, ux
+        self.parent[uy] = ux
+        size[ux] += size[uy]
+        self.count -= 1
+        return True
+
+    def connected(self, x, y):
+        return self.find(x) == self.find(y)
+
+    def component_size(self, x):
+        return self.size[self.find(x)]
+
+    def find_many(self, xs):
+        '''Returns an array with the root of every x in xs.'''
+        parent = self.parent
+        res = array('l')
+        append = res.append
+        for x in xs:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            append(x)
+        return res
+
+    def union_many(self, xs, ys):
+        '''Unions xs[i] with ys[i] for every i, in order.
+        Returns a bytearray whose i-th entry is 1 if the
+        i-th union merged two components.'''
+        parent, size = self.parent, self.size
+        res = bytearray()
+        append = res.append
+        merged = 0
+        for x, y in zip(xs, ys):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            while parent[y] != y:
+                parent[y] = parent[parent[y]]
+                y = parent[y]
+            if x == y:
+                append(0)
+                continue
+            if size[x] < size[y]:
+                x, y = y, x
+            parent[y] = x
+            size[x] += size[y]
+            merged += 1
+            append(1)
+        self.count -= merged
+        return res
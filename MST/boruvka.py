@@ -0,0 +1,151 @@
+'''
+    Borůvka's minimal spanning tree algorithm, with the edge
+    scans spread over a process pool.
+
+    Each round every component picks its cheapest outgoing edge,
+    and all of these edges are added at once.  Every component
+    merges with at least one other, so there are at most log(V)
+    rounds.  Ties are broken by edge index, so the chosen edges
+    never form a cycle.
+
+    The scan for the cheapest edges is the expensive part and
+    parallelizes well: the edges are split into ranges, and each
+    worker process returns the cheapest edge of every component
+    within its range.  The edge arrays and the array of current
+    component ids live in shared memory, so the workers read them
+    without copying; only the small per-range results are sent
+    back.  Between rounds the main process does the unions and
+    writes the new component ids.
+
+    O(E log(V)) time, O(V + E) space.
+
+    Same input and output format as kruskal.py.
+'''
+
+import concurrent.futures
+import os
+from array import array
+from multiprocessing import shared_memory
+
+from kruskal import edge_arrays
+from UnionFind import ArrayUnionFind
+
+# The arrays seen by a worker process, set up by _attach.
+_shared = {}
+
+
+def _cheapest(us, vs, ws, comp, lo, hi):
+    '''Returns a dictionary from component ids to the index
+    of their cheapest edge among the edges lo, ..., hi - 1.'''
+    best = {}
+    for k in range(lo, hi):
+        a = comp[us[k]]
+        b = comp[vs[k]]
+        if a == b:
+            continue
+        w = ws[k]
+        j = best.get(a)
+        if j is None or w < ws[j]:
+            best[a] = k
+        j = best.get(b)
+        if j is None or w < ws[j]:
+            best[b] = k
+    return best
+
+
+def _attach(names):
+    for key, (name, fmt) in names.items():
+        block = shared_memory.SharedMemory(name=name)
+        _shared[key + "_block"] = block
+        _shared[key] = block.buf.cast(fmt)
+
+
+def _cheapest_shared(lo, hi):
+    return _cheapest(_shared["us"], _shared["vs"], _shared["ws"],
+                     _shared["comp"], lo, hi)
+
+
+def _merge(best, other, ws):
+    for a, k in other.items():
+        j = best.get(a)
+        if j is None or ws[k] < ws[j] or (ws[k] == ws[j] and k < j):
+            best[a] = k
+
+
+def boruvka(G, weights, processes=None, chunks_per_process=4):
+    '''Returns a list of edges [(u,v),...] in a minimal
+    spanning forest of G.
+
+    processes is the number of worker processes (the number
+    of CPUs if None).  With processes=1 everything runs in
+    this process.
+
+    >>> G = {0: [1, 2], 1: [0, 2], 2: [0, 1]}
+    >>> weights = {(0, 1): 1, (1, 0): 1, (1, 2): 2, (2, 1): 2,
+    ...            (0, 2): 3, (2, 0): 3}
+    >>> sorted(boruvka(G, weights, processes=1))
+    [(0, 1), (1, 2)]
+    '''
+    labels, us, vs, ws = edge_arrays(G, weights)
+    V, E = len(labels), len(us)
+    if processes == 1 or E == 0:
+        comp = list(range(V))
+        return _boruvka(labels, us, vs, ws, comp,
+                        lambda: [_cheapest(us, vs, ws, comp, 0, E)])
+
+    blocks = []
+    views = {}
+    try:
+        # Copy the arrays into shared memory.
+        names = {}
+        for key, data in (("us", us), ("vs", vs), ("ws", ws),
+                          ("comp", array('i', range(V)))):
+            block = shared_memory.SharedMemory(
+                create=True, size=data.itemsize * len(data))
+            blocks.append(block)
+            view = block.buf.cast(data.typecode)
+            view[:len(data)] = data
+            names[key] = (block.name, data.typecode)
+            views[key] = view
+
+        if processes is None:
+            processes = os.cpu_count()
+        n = processes * chunks_per_process
+        bounds = [E * i // n for i in range(n + 1)]
+        with concurrent.futures.ProcessPoolExecutor(
+                processes, initializer=_attach, initargs=(names,)) as pool:
+
+            def scan():
+                return pool.map(_cheapest_shared, bounds[:-1], bounds[1:])
+
+            return _boruvka(labels, us, vs, ws, views["comp"], scan)
+    finally:
+        for view in views.values():
+            view.release()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _boruvka(labels, us, vs, ws, comp, scan):
+    '''The rounds of Borůvka; scan() returns the per-range
+    dictionaries of cheapest edges for the current comp.'''
+    V = len(labels)
+    uf = ArrayUnionFind(V)
+    res = []
+    while True:
+        best = {}
+        for part in scan():
+            _merge(best, part, ws)
+        if len(best) == 0:
+            return res
+        for k in best.values():
+            if uf.union(us[k], vs[k]):
+                res.append((labels[us[k]], labels[vs[k]]))
+        for v in range(V):
+            comp[v] = uf.find(v)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
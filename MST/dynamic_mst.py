@@ -0,0 +1,179 @@
+'''
+    Keeping a minimal spanning forest up to date while the graph
+    changes, instead of rerunning kruskal or prim_heap.
+
+    Two facts about minimal spanning forests do the work:
+
+    (1) Cycle property: adding an edge (u, v) to the forest
+    closes a cycle with the forest path from u to v (if u and v
+    are connected at all).  The new forest is obtained by
+    dropping the heaviest edge on that cycle.
+
+    (2) Cut property: deleting a forest edge splits its tree in
+    two, and the lightest graph edge crossing between the two
+    halves (if any) reconnects them.
+
+    Only the forest around the change is looked at: the path
+    between u and v for (1), and for (2) the smaller of the two
+    halves (found by searching both halves in turn until one of
+    them runs out) and the graph edges leaving it.
+
+    Changing a weight is one of these: lowering a non-forest
+    edge is (1), raising a forest edge is (2) with that edge
+    still allowed as the replacement, and the other two cases
+    need no change of the forest.
+
+    The total weight and the set of forest edges are kept up to
+    date, so reading them is O(1).
+
+    Graphs given as adjacency list containing both directions
+    of every edge, with a dictionary of weights, as in
+    kruskal.py and prim.py.
+'''
+
+from kruskal import kruskal
+
+
+class DynamicMST:
+    '''
+    >>> G = {0: [1, 2], 1: [0, 2], 2: [0, 1]}
+    >>> weights = {(0, 1): 1, (1, 0): 1, (1, 2): 2, (2, 1): 2,
+    ...            (0, 2): 3, (2, 0): 3}
+    >>> T = DynamicMST(G, weights)
+    >>> T.weight, sorted(T.edges)
+    (3, [(0, 1), (1, 2)])
+    >>> T.insert_edge(2, 3, 5)
+    >>> T.update_weight(0, 2, 0)
+    >>> T.weight, sorted(T.edges)
+    (6, [(0, 1), (0, 2), (2, 3)])
+    >>> T.delete_edge(0, 1)
+    >>> T.weight, sorted(T.edges)
+    (7, [(0, 2), (1, 2), (2, 3)])
+    '''
+
+    def __init__(self, G, weights, engine=kruskal):
+        '''engine is any of the functions in this directory
+        returning the edges of a minimal spanning forest.'''
+        self.adj = {v: {} for v in G.keys()}
+        for u in G.keys():
+            for v in G[u]:
+                self.adj[u][v] = weights[(u, v)]
+                self.adj.setdefault(v, {})[u] = weights[(u, v)]
+
+        self.forest = {v: {} for v in self.adj}
+        self.edges = set()
+        self.weight = 0
+        for u, v in engine(G, weights):
+            self._link(u, v, self.adj[u][v])
+
+    def _link(self, u, v, w):
+        self.forest[u][v] = w
+        self.forest[v][u] = w
+        self.edges.add((u, v))
+        self.weight += w
+
+    def _cut(self, u, v):
+        w = self.forest[u].pop(v)
+        del self.forest[v][u]
+        self.edges.discard((u, v))
+        self.edges.discard((v, u))
+        self.weight -= w
+
+    def _path(self, u, v):
+        '''Returns the forest path from u to v as a list of
+        vertices, or None if they are not connected.'''
+        parent = {u: None}
+        stack = [u]
+        while len(stack) > 0:
+            x = stack.pop()
+            if x == v:
+                path = [v]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                return path
+            for y in self.forest[x]:
+                if y not in parent:
+                    parent[y] = x
+                    stack.append(y)
+        return None
+
+    def _smaller_side(self, u, v):
+        '''After the forest edge (u, v) was cut, returns the
+        vertex set of the smaller of the trees of u and v,
+        searching both in turn.'''
+        sides = ({u}, {v})
+        stacks = ([u], [v])
+        while True:
+            for i in (0, 1):
+                if len(stacks[i]) == 0:
+                    return sides[i]
+                x = stacks[i].pop()
+                for y in self.forest[x]:
+                    if y not in sides[i]:
+                        sides[i].add(y)
+                        stacks[i].append(y)
+
+    def _reconnect(self, u, v):
+        '''Adds the lightest graph edge between the trees of u
+        and v, if there is one.'''
+        side = self._smaller_side(u, v)
+        best = None
+        for x in side:
+            for y, w in self.adj[x].items():
+                if y not in side and (best is None or w < best[2]):
+                    best = (x, y, w)
+        if best is not None:
+            self._link(*best)
+
+    def _add_to_forest(self, u, v, w):
+        '''Cycle property step for a graph edge (u, v) of
+        weight w that is not in the forest.'''
+        if u == v:
+            return
+        path = self._path(u, v)
+        if path is None:
+            self._link(u, v, w)
+            return
+        heaviest = max(zip(path, path[1:]),
+                       key=lambda e: self.forest[e[0]][e[1]])
+        if self.forest[heaviest[0]][heaviest[1]] > w:
+            self._cut(*heaviest)
+            self._link(u, v, w)
+
+    def insert_edge(self, u, v, w):
+        if v in self.adj.get(u, {}):
+            self.update_weight(u, v, w)
+            return
+        self.adj.setdefault(u, {})[v] = w
+        self.adj.setdefault(v, {})[u] = w
+        self.forest.setdefault(u, {})
+        self.forest.setdefault(v, {})
+        self._add_to_forest(u, v, w)
+
+    def delete_edge(self, u, v):
+        del self.adj[u][v]
+        del self.adj[v][u]
+        if v in self.forest[u]:
+            self._cut(u, v)
+            self._reconnect(u, v)
+
+    def update_weight(self, u, v, w):
+        old = self.adj[u][v]
+        self.adj[u][v] = w
+        self.adj[v][u] = w
+        if v in self.forest[u]:
+            if w <= old:
+                # Still the lightest edge across its cut.
+                self.forest[u][v] = w
+                self.forest[v][u] = w
+                self.weight += w - old
+            else:
+                self._cut(u, v)
+                self._reconnect(u, v)
+        elif w < old:
+            self._add_to_forest(u, v, w)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,75 @@
+'''
+    Filter-Kruskal (Osipov, Sanders and Singler).
+
+    Kruskal sorts all the edges, but once the light edges have
+    been processed most of the heavy ones join two vertices that
+    are already connected and are never used.  Filter-Kruskal
+    works like quicksort: pick a pivot weight, split the edges
+    into the light ones (weight at most the pivot) and the heavy
+    ones, run on the light ones first, and then throw away every
+    heavy edge inside a single component before going on with
+    them.  Small sets of edges are sorted directly.
+
+    On graphs that are not too sparse this avoids sorting most
+    of the edges: expected time O(E + V log(V) log(E / V)).
+
+    Same input and output format as kruskal.py.
+'''
+
+import random
+
+from kruskal import edge_arrays
+from UnionFind import ArrayUnionFind
+
+# Below this many edges, sort instead of partitioning.
+THRESHOLD = 1024
+
+
+def filter_kruskal(G, weights, seed=0):
+    '''Returns a list of edges [(u,v),...] in a
+    minimal spanning forest of G.
+
+    >>> G = {0: [1, 2], 1: [0, 2], 2: [0, 1]}
+    >>> weights = {(0, 1): 1, (1, 0): 1, (1, 2): 2, (2, 1): 2,
+    ...            (0, 2): 3, (2, 0): 3}
+    >>> filter_kruskal(G, weights)
+    [(0, 1), (1, 2)]
+    '''
+    labels, us, vs, ws = edge_arrays(G, weights)
+    V = len(labels)
+    uf = ArrayUnionFind(V)
+    rnd = random.Random(seed)
+    res = []
+
+    # Lists of edge indices still to be processed, the lightest
+    # on top.  Each list is filtered when it is popped.
+    stack = [list(range(len(us)))]
+    while len(stack) > 0 and len(res) < V - 1:
+        edges = stack.pop()
+        find = uf.find
+        edges = [k for k in edges if find(us[k]) != find(vs[k])]
+
+        if len(edges) > THRESHOLD:
+            pivot = ws[rnd.choice(edges)]
+            light = [k for k in edges if ws[k] < pivot]
+            equal = [k for k in edges if ws[k] == pivot]
+            heavy = [k for k in edges if ws[k] > pivot]
+            if len(equal) < len(edges):
+                for part in (heavy, equal, light):
+                    if len(part) > 0:
+                        stack.append(part)
+                continue
+            # All the weights are equal, so edges is sorted.
+        else:
+            edges.sort(key=ws.__getitem__)
+
+        for k in edges:
+            if uf.union(us[k], vs[k]):
+                res.append((labels[us[k]], labels[vs[k]]))
+
+    return res
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
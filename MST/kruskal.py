@@ -1,7 +1,10 @@
-from UnionFind import UnionFind
+import time
+from array import array
 
+from UnionFind import ArrayUnionFind
 
-def kruskal(G, weights):
+
+def kruskal(G, weights, stats=None):
     '''Returns a list of edges [(u,v),...] in a 
     minimal spanning forest.
 
@@ -15,18 +18,50 @@ def kruskal(G, weights):
                                    = O((V+E) log(V))
     Space Complexity:
     O(E)
+
+    If stats is given (a collections.Counter, say)
+    the union-find operations are counted in it (see
+    UnionFind.py), and the seconds spent sorting and
+    scanning the edges are added to its "time sort"
+    and "time scan" entries.
     '''
+    if stats is not None:
+        start = time.perf_counter()
     edges = []
     for v in G.keys():
-        for w in G[w]:
+        for w in G[v]:
             edges.append((v, w))
 
     edges.sort(key=lambda x: weights[x])
-    uf = UnionFind(edges)
+    index = {v: i for i, v in enumerate(G.keys())}
+    uf = ArrayUnionFind(len(index), stats)
+    if stats is not None:
+        sorted_at = time.perf_counter()
     res = []
     for edge in edges:
         u, v = edge
-        if uf.find(u) != uf.find(v):
+        if uf.union(index[u], index[v]):
             res.append(edge)
-            uf.union(u, v)
+    if stats is not None:
+        stats["time sort"] += sorted_at - start
+        stats["time scan"] += time.perf_counter() - sorted_at
     return res
+
+
+def edge_arrays(G, weights):
+    '''Returns (labels, us, vs, ws): the vertices of G in
+    order, and for every undirected edge its endpoints (as
+    indices into labels) and weight in flat arrays.  An edge
+    listed in both directions is only taken once.'''
+    labels = list(G.keys())
+    index = {v: i for i, v in enumerate(labels)}
+    us = array('i')
+    vs = array('i')
+    ws = array('d')
+    for v in G.keys():
+        for w in G[v]:
+            if index[v] < index[w] or (w, v) not in weights:
+                us.append(index[v])
+                vs.append(index[w])
+                ws.append(weights[(v, w)])
+    return labels, us, vs, ws
@@ -0,0 +1,128 @@
+'''
+    Kruskal's algorithm for edge lists that do not fit in memory.
+
+    kruskal.py builds the list of all edges and sorts it.  But
+    Kruskal only ever looks at the edges one at a time in order
+    of weight, so if the edges arrive already sorted the only
+    state we need is the union-find over the vertices, and we
+    can stop once V - 1 edges are accepted (then the tree
+    spans everything).
+
+    Edges are records (weight, u, v) with u, v in 0, ..., V - 1.
+    They can come from any iterator, or from a binary edge file
+    of packed records (see write_edge_file), which is read
+    through mmap so the operating system pages it in and out.
+    Unsorted input is sorted externally: it is cut into chunks
+    of chunk_size records that are sorted in memory and written
+    to temporary run files, which are then merged with
+    heapq.merge while Kruskal consumes the merged stream.
+
+    Time O(E log(E)) to sort (O(E alpha(V)) if pre-sorted),
+    memory O(V + chunk_size).
+'''
+
+import heapq
+import itertools
+import mmap
+import struct
+import tempfile
+
+from UnionFind import ArrayUnionFind
+
+# Little-endian float64 weight, int32 u, int32 v.
+RECORD = struct.Struct('<dii')
+
+
+def write_edge_file(path, records):
+    '''Writes the (weight, u, v) records to a binary edge file.'''
+    with open(path, 'wb') as f:
+        _write_records(f, records)
+
+
+def _write_records(f, records):
+    pack = RECORD.pack
+    f.writelines(pack(w, u, v) for w, u, v in records)
+
+
+def read_edge_file(path):
+    '''Iterates over the (weight, u, v) records of a binary
+    edge file, using mmap.'''
+    with open(path, 'rb') as f:
+        yield from _read_records(f)
+
+
+def _read_records(f):
+    f.seek(0, 2)
+    if f.tell() == 0:
+        return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        view = memoryview(m)
+        try:
+            yield from RECORD.iter_unpack(view)
+        finally:
+            view.release()
+
+
+def kruskal_sorted(V, records):
+    '''Returns a list of edges [(u,v),...] in a minimal
+    spanning forest of the graph on 0, ..., V - 1 whose
+    edges are the (weight, u, v) records, which must come
+    in non-decreasing order of weight.
+
+    >>> kruskal_sorted(4, [(1, 0, 1), (2, 1, 2), (3, 0, 2), (4, 2, 3)])
+    [(0, 1), (1, 2), (2, 3)]
+    '''
+    uf = ArrayUnionFind(V)
+    res = []
+    if V <= 1:
+        return res
+    for _, u, v in records:
+        if uf.union(u, v):
+            res.append((u, v))
+            if len(res) == V - 1:
+                break
+    return res
+
+
+def kruskal_stream(V, records, presorted=False, chunk_size=1 << 20,
+                   tmpdir=None):
+    '''Same as kruskal_sorted, but the records can be in any
+    order unless presorted is True.  records may also be the
+    path of a binary edge file.
+
+    >>> kruskal_stream(4, [(4, 2, 3), (3, 0, 2), (2, 1, 2), (1, 0, 1)],
+    ...                chunk_size=2)
+    [(0, 1), (1, 2), (2, 3)]
+    '''
+    if isinstance(records, str):
+        records = read_edge_file(records)
+    if presorted:
+        return kruskal_sorted(V, records)
+
+    runs = []
+    try:
+        records = iter(records)
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if len(chunk) == 0:
+                break
+            chunk.sort()
+            f = tempfile.TemporaryFile(dir=tmpdir)
+            runs.append(f)
+            _write_records(f, chunk)
+            f.flush()
+        del chunk
+
+        merged = heapq.merge(*(_read_records(f) for f in runs))
+        try:
+            return kruskal_sorted(V, merged)
+        finally:
+            merged.close()
+    finally:
+        for f in runs:
+            f.close()
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
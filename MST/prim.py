@@ -1,4 +1,5 @@
 import heapq
+from array import array
 
 # Set-based implementation of Prim.
 # O(V(V + E)) time, O(V + E) space
@@ -42,7 +43,7 @@ def prim(G, weights):
 # Space O(V + E).
 
 
-def prim_heap(G, weights):
+def prim_heap(G, weights, queue=None, stats=None):
     '''Takes as input a graph given as an 
     adjacency list (in the form of a dictionary
     with node keys and list of node values) and a 
@@ -50,13 +51,28 @@ def prim_heap(G, weights):
 
     Returns the list of edges in a minimal spanning 
     tree of G.    
+
+    By default a heapq list with lazy deletion is
+    used.  queue can instead be an addressable heap
+    class (BinaryHeap or PairingHeap from
+    ShortestPath/heaps.py), which uses decrease-key
+    and keeps at most V entries.
+
+    If stats is given (a collections.Counter, say)
+    the operation counts are added to it, see
+    Benchmarks/stats.py.
     '''
 
+    if queue is not None:
+        return _prim_decrease_key(G, weights, queue, stats)
+
     INF = float("inf")
 
     d = {v: INF for v in G.keys()}
-    h = heapq.heapify([(v, k) for k, v in d.items()])
+    h = [(v, k) for k, v in d.items()]
+    heapq.heapify(h)
     seen = set()
+    pushes = 0
 
     parents = {}
     while len(h) > 0:
@@ -71,10 +87,117 @@ def prim_heap(G, weights):
             if v not in seen and weight < d[v]:
                 d[v] = weight
                 heapq.heappush(h, (weight, v))
+                pushes += 1
                 parents[v] = u
         seen.add(u)
 
+    if stats is not None:
+        # Every vertex starts with one entry and is taken from
+        # the heap once at its final weight.
+        V = len(d)
+        stats["relaxations"] += sum(len(G[u]) for u in G.keys())
+        stats["improvements"] += pushes
+        stats["heap_pushes"] += V + pushes
+        stats["heap_pops"] += V + pushes
+        stats["stale_pops"] += pushes
+
     edges = []
     for v in parents:
         edges.append((v, parents[v]))
     return edges
+
+
+# Addressable heap implementation of Prim.
+# Time O((V + E)log(V)) with a binary heap, space O(V).
+
+
+def _prim_decrease_key(G, weights, queue, stats=None):
+    INF = float("inf")
+
+    d = {v: INF for v in G.keys()}
+    seen = set()
+    pushes = 0
+    decrease_keys = 0
+
+    parents = {}
+    for root in G.keys():
+        if root in seen:
+            continue
+        h = queue()
+        h.push(root, 0)
+        pushes += 1
+        while len(h) > 0:
+            _, u = h.pop()
+            seen.add(u)
+
+            for v in G[u]:
+                weight = weights[(u, v)]
+                if v not in seen and weight < d[v]:
+                    if d[v] == INF:
+                        h.push(v, weight)
+                        pushes += 1
+                    else:
+                        h.decrease_key(v, weight)
+                        decrease_keys += 1
+                    d[v] = weight
+                    parents[v] = u
+
+    if stats is not None:
+        # Every vertex but the roots got a parent when pushed.
+        stats["relaxations"] += sum(len(G[u]) for u in G.keys())
+        stats["improvements"] += (len(parents) - len(d) + pushes
+                                  + decrease_keys)
+        stats["heap_pushes"] += pushes
+        stats["heap_pops"] += pushes
+        stats["decrease_keys"] += decrease_keys
+
+    edges = []
+    for v in parents:
+        edges.append((v, parents[v]))
+    return edges
+
+
+# Min-heap implementation of Prim over a CSRGraph
+# (see ShortestPath/csr.py).  The graph should contain
+# both directions of every edge.
+# Time O((V+E)log(V)), space O(V) on top of the graph.
+
+
+def prim_csr(C):
+    '''Same as prim_heap but on a CSRGraph.
+
+    Returns the list of edges (v, parent of v), given
+    by vertex labels, in a minimal spanning forest.
+    '''
+
+    INF = float("inf")
+    offsets, targets, weights = C.offsets, C.targets, C.weights
+    V = len(C)
+
+    d = array('d', [INF]) * V
+    parents = array('q', [-1]) * V
+    seen = bytearray(V)
+
+    for root in range(V):
+        if seen[root]:
+            continue
+        h = [(0, root)]
+        while len(h) > 0:
+            priority, u = heapq.heappop(h)
+
+            # Stale entry.
+            if seen[u]:
+                continue
+            seen[u] = 1
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                weight = weights[k]
+                if not seen[v] and weight < d[v]:
+                    d[v] = weight
+                    parents[v] = u
+                    heapq.heappush(h, (weight, v))
+
+    labels = C.labels
+    return [(labels[v], labels[parents[v]])
+            for v in range(V) if parents[v] != -1]
@@ -0,0 +1,55 @@
+'''
+    Prim's algorithm on a dense graph given as a V x V NumPy
+    weight matrix W, with W[i][j] = inf where there is no edge.
+
+    The set-based prim in prim.py does O(V^2) work, which is the
+    best possible on a complete graph, but it does it one Python
+    operation at a time.  Here the keys d and the tree mask are
+    arrays, so each of the V steps is one vectorized argmin and
+    one vectorized update of d with the row W[u].
+
+    O(V^2) time (in V vectorized steps), O(V) space on top of W.
+'''
+
+import numpy as np
+
+
+def prim_dense(W):
+    '''Returns the list of edges (v, parent of v) in a
+    minimal spanning forest of the undirected graph with
+    symmetric weight matrix W.
+
+    >>> inf = float("inf")
+    >>> W = [[inf, 1, 3], [1, inf, 2], [3, 2, inf]]
+    >>> prim_dense(W)
+    [(1, 0), (2, 1)]
+    '''
+    W = np.asarray(W, dtype=np.float64)
+    V = len(W)
+    INF = np.inf
+
+    # d[v] is the lightest edge from the tree to v, and inf
+    # for the vertices already in the tree.
+    d = np.full(V, INF)
+    in_tree = np.zeros(V, dtype=bool)
+    parents = np.full(V, -1, dtype=np.int64)
+
+    for _ in range(V):
+        u = int(np.argmin(d))
+        if d[u] == INF:
+            # Start a new tree at any vertex not yet reached.
+            u = int(np.argmin(in_tree))
+        in_tree[u] = True
+        d[u] = INF
+
+        row = W[u]
+        better = (row < d) & ~in_tree
+        d[better] = row[better]
+        parents[better] = u
+
+    return [(v, int(parents[v])) for v in range(V) if parents[v] != -1]
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,279 @@
+'''
+    All-pairs shortest paths.
+
+    (1) Johnson's algorithm, for sparse graphs that may have
+    negative edges (but no negative cycles).  Add a new vertex q
+    with a 0 weight edge to every vertex and find the distances
+    h[v] from q with Bellman-Ford (here the queue-based spfa).
+    By the triangle inequality the reweighted edges
+
+        w'(u, v) = w(u, v) + h[u] - h[v]
+
+    are non-negative, and every path from s to t changes by the
+    same amount h[s] - h[t], so shortest paths stay shortest.
+    Then run Dijkstra from every source on w' and undo the
+    change: d(s, t) = d'(s, t) - h[s] + h[t].
+
+    The V runs of Dijkstra are independent, so they are spread
+    over a process pool.  The reweighted graph is a CSRGraph
+    (csr.py) whose arrays are copied once into shared memory,
+    where every worker reads them without a copy.  The results
+    are either streamed back one source at a time (all_pairs),
+    with only a few batches of sources in flight at once,
+    or written by the workers straight into a memory-mapped
+    V x V float32 matrix on disk (all_pairs_matrix), so the V^2
+    distances never have to be in RAM at once.
+
+    O(VE + V(V+E)log(V)) time.
+
+    (2) Floyd-Warshall on a dense NumPy weight matrix, done by
+    blocks (floyd_warshall_blocked): for each block of b
+    intermediate vertices the b x b diagonal block is closed
+    first, then the row and column panels through it, and then
+    every other entry with one min-plus product against the
+    panels.  Each phase is a handful of NumPy calls on large
+    arrays instead of a Python loop over V^3 triples.
+
+    O(V^3) time, O(V^2) space.
+'''
+
+import collections
+import concurrent.futures
+import os
+import struct
+from array import array
+from multiprocessing import shared_memory
+
+from bellman_ford import spfa
+from csr import CSRGraph
+from dijkstra import dijkstra_csr
+
+# The reweighted graph, potentials (and output matrix) seen by
+# a worker process.
+_shared = {}
+
+
+def johnson_graph(G, weights):
+    '''Returns (C, h): the CSRGraph of G with the Johnson
+    reweighted weights, and the array of potentials h indexed
+    like C.  Raises ValueError if G has a negative cycle.'''
+    q = object()
+    G_q = dict(G)
+    G_q[q] = list(G.keys())
+    weights_q = dict(weights)
+    for v in G.keys():
+        weights_q[(q, v)] = 0
+
+    d, cycle = spfa(G_q, weights_q, q)
+    if d is None:
+        raise ValueError("negative cycle: %r" % (cycle,))
+
+    C = CSRGraph.from_dict(G, weights)
+    h = array('d', (d[v] for v in C.labels))
+    offsets, targets, w = C.offsets, C.targets, C.weights
+    for u in range(len(C)):
+        for k in range(offsets[u], offsets[u + 1]):
+            # Clamp rounding errors so Dijkstra sees w' >= 0.
+            w[k] = max(0.0, w[k] + h[u] - h[targets[k]])
+    return C, h
+
+
+def _dijkstra(C, h, s):
+    '''Dijkstra from the vertex with index s on the reweighted
+    graph C, returning the original distances as an
+    array('d').'''
+    INF = float("inf")
+    d = dijkstra_csr(C, C.labels[s])
+    hs = h[s]
+    for v in range(len(d)):
+        if d[v] != INF:
+            d[v] = d[v] - hs + h[v]
+    return d
+
+
+def _view(block, fmt, n):
+    # The block can be larger than asked for (the OS may round
+    # it up to a page), so cut the view to the n items written.
+    return block.buf[:struct.calcsize(fmt) * n].cast(fmt)
+
+
+def _attach(names, V, matrix_path):
+    for key, (name, fmt, n) in names.items():
+        block = shared_memory.SharedMemory(name=name)
+        _shared[key + "_block"] = block
+        _shared[key] = _view(block, fmt, n)
+    if "offsets" in names:
+        # Labeled by index, so the labels are the indices.
+        _shared["graph"] = CSRGraph(range(V),
+                                    _shared.pop("offsets"),
+                                    _shared.pop("targets"),
+                                    _shared.pop("weights"))
+    if matrix_path is not None:
+        import numpy as np
+        _shared["matrix"] = np.memmap(matrix_path, dtype=np.float32,
+                                      mode='r+', shape=(V, V))
+
+
+def _row(s):
+    d = _dijkstra(_shared["graph"], _shared["h"], s)
+    if "matrix" in _shared:
+        _shared["matrix"][s] = d
+        return s, None
+    return s, d
+
+
+def _rows(start, stop):
+    return [_row(s) for s in range(start, stop)]
+
+
+def _run(C, h, processes, matrix_path):
+    '''Yields (index of s, distances from s or None) for every
+    vertex s, computed by processes workers.  At most two
+    batches of sources per worker are in flight, so a slow
+    consumer holds O(processes * V) distances, not O(V^2).'''
+    V = len(C)
+    if processes == 1:
+        _shared.clear()
+        _shared.update(graph=C, h=h)
+        if matrix_path is not None:
+            _attach({}, V, matrix_path)
+        try:
+            for s in range(V):
+                yield _row(s)
+        finally:
+            _shared.clear()
+        return
+
+    blocks = []
+    views = []
+    try:
+        names = {}
+        for key, data in (("offsets", C.offsets), ("targets", C.targets),
+                          ("weights", C.weights), ("h", h)):
+            # At least one item, as a block can not be empty.
+            block = shared_memory.SharedMemory(
+                create=True, size=data.itemsize * max(1, len(data)))
+            blocks.append(block)
+            view = _view(block, data.typecode, len(data))
+            views.append(view)
+            view[:] = data
+            names[key] = (block.name, data.typecode, len(data))
+
+        workers = processes or os.cpu_count() or 1
+        chunk = max(1, min(64, V // (4 * workers)))
+        with concurrent.futures.ProcessPoolExecutor(
+                processes, initializer=_attach,
+                initargs=(names, V, matrix_path)) as pool:
+            pending = collections.deque()
+            try:
+                for start in range(0, V, chunk):
+                    pending.append(pool.submit(_rows, start,
+                                               min(start + chunk, V)))
+                    if len(pending) >= 2 * workers:
+                        yield from pending.popleft().result()
+                while len(pending) > 0:
+                    yield from pending.popleft().result()
+            finally:
+                # The consumer may have stopped early.
+                for future in pending:
+                    future.cancel()
+    finally:
+        for view in views:
+            view.release()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def all_pairs(G, weights, processes=None):
+    '''Yields (s, d) for every vertex s of G, where d is an
+    array('d') of the distances from s: d[i] is the distance
+    to CSRGraph.from_dict(G).labels[i] (the keys of G in
+    order), inf if unreachable.
+
+    processes is the number of worker processes (the number
+    of CPUs if None); with 1 everything runs in this process.
+    Raises ValueError if G has a negative cycle.
+
+    >>> G = {0: [1, 2], 1: [2], 2: [0]}
+    >>> weights = {(0, 1): 4, (0, 2): 1, (1, 2): -2, (2, 0): 3}
+    >>> for s, d in all_pairs(G, weights, processes=1):
+    ...     print(s, list(d))
+    0 [0.0, 4.0, 1.0]
+    1 [1.0, 0.0, -2.0]
+    2 [3.0, 7.0, 0.0]
+    >>> for s, d in all_pairs({0: [], 1: []}, {}, processes=2):
+    ...     print(s, list(d))
+    0 [0.0, inf]
+    1 [inf, 0.0]
+    '''
+    C, h = johnson_graph(G, weights)
+    labels = C.labels
+    for s, d in _run(C, h, processes, None):
+        yield labels[s], d
+
+
+def all_pairs_matrix(G, weights, path, processes=None):
+    '''Writes the V x V float32 matrix of distances (row s,
+    column t, both indexed like CSRGraph.from_dict(G).labels)
+    to a memory-mapped file at path and returns (labels,
+    matrix), where matrix is the numpy.memmap.'''
+    import numpy as np
+    C, h = johnson_graph(G, weights)
+    V = len(C)
+    matrix = np.memmap(path, dtype=np.float32, mode='w+', shape=(V, V))
+    matrix.flush()
+    for s, d in _run(C, h, processes, path):
+        if d is not None:
+            matrix[s] = d
+    matrix.flush()
+    return C.labels, matrix
+
+
+def floyd_warshall_blocked(W, block=128):
+    '''Returns the matrix of shortest path distances for the
+    V x V weight matrix W (inf where there is no edge; the
+    diagonal is taken to be 0).  Negative edges are allowed;
+    raises ValueError if there is a negative cycle.
+
+    >>> inf = float("inf")
+    >>> floyd_warshall_blocked([[0, 4, 1], [inf, 0, -2], [3, inf, 0]],
+    ...                        block=2).tolist()
+    [[0.0, 4.0, 1.0], [1.0, 0.0, -2.0], [3.0, 7.0, 0.0]]
+    '''
+    import numpy as np
+    D = np.array(W, dtype=np.float64)
+    V = len(D)
+    np.fill_diagonal(D, np.minimum(np.diagonal(D), 0))
+
+    for k0 in range(0, V, block):
+        B = slice(k0, min(k0 + block, V))
+
+        # Phase 1: the diagonal block, with plain Floyd-Warshall.
+        diag = D[B, B]
+        for k in range(diag.shape[0]):
+            np.minimum(diag, diag[:, k, None] + diag[None, k, :], out=diag)
+
+        # Phase 2: the row and column panels through the block.
+        row = D[B, :]
+        col = D[:, B]
+        for k in range(diag.shape[0]):
+            np.minimum(row, diag[:, k, None] + row[None, k, :], out=row)
+            np.minimum(col, col[:, k, None] + diag[None, k, :], out=col)
+
+        # Phase 3: everything else, as a min-plus product of the
+        # panels, a few rows at a time to bound the temporary.
+        rows = max(1, (1 << 22) // (block * V))
+        for i0 in range(0, V, rows):
+            I = slice(i0, min(i0 + rows, V))
+            through = (col[I, :, None] + row[None, :, :]).min(axis=1)
+            np.minimum(D[I], through, out=D[I])
+
+    if (np.diagonal(D) < 0).any():
+        raise ValueError("negative cycle")
+    return D
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
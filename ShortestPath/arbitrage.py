@@ -78,4 +78,7 @@ given an arbirary tolerance parameter as input.
 
 To make this a bit more involved we could also
 ask to return the cycle if one exists.  
+
+Both are done (vectorized with NumPy) by
+find_arbitrage in arbitrage_numpy.py.
 '''
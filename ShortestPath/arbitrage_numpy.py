@@ -0,0 +1,257 @@
+'''
+    Vectorized version of arbitrage.py using NumPy.  See there
+    for the reduction: an arbitrage opportunity is a negative
+    cycle in the complete graph with weights -log(r_ij).
+
+    The pure Python version does V - 1 rounds of V^2 interpreter
+    level relaxations.  Here one round of Bellman-Ford on the
+    adjacency matrix W is a single min-plus product
+
+        d'[j] = min(d[j], min_i d[i] + W[i][j])
+
+    done with NumPy, and we stop as soon as a round changes
+    nothing.  We also start with d = 0 at every vertex (as if
+    there were an extra source with 0 weight edges to every
+    currency), so cycles are found wherever they are.
+
+    With a negative cycle the rounds never stop changing, so
+    after every round we look for a cycle in the predecessor
+    graph pred (pred[j] is the i attaining the minimum above).
+    Any such cycle is negative, and one appears soon after
+    the cycle is first traversed -- usually after a handful of
+    rounds rather than V.
+
+    Fees: a cycle that is profitable at all can be traversed
+    repeatedly to beat any fixed threshold on the total gain,
+    so the meaningful threshold is per trade.  With tolerance
+    t >= 1 a trade i -> j counts as r_ij / t, i.e. we look for
+    a cycle of length k with product of rates above t^k.
+
+    Time O(kV^2) for k rounds (k <= V), space O(V^2).
+'''
+
+import numpy as np
+
+# Relaxations that improve a distance by less than this are
+# ignored, so rounding in the logs cannot create cycles.
+EPS = 1e-12
+
+
+def log_weights(R, tolerance=1.0):
+    '''Returns the V x V matrix W[i][j] = -log(r_ij / tolerance)
+    with the diagonal set to infinity.  Zero rates give
+    infinite weights (no edge).'''
+    R = np.asarray(R, dtype=np.float64)
+    with np.errstate(divide="ignore"):
+        W = np.log(tolerance) - np.log(R)
+    np.fill_diagonal(W, np.inf)
+    return W
+
+
+def predecessor_cycle(pred, starts):
+    '''Returns a cycle [v_0, v_1, ..., v_0] in the graph of
+    edges (pred[v], v) reached by walking back from one of
+    starts, or [] if there is none.'''
+    walked = {}
+    for walk, root in enumerate(starts):
+        v = int(root)
+        while v != -1 and v not in walked:
+            walked[v] = walk
+            v = int(pred[v])
+        if v != -1 and walked[v] == walk:
+            cycle = [v]
+            u = int(pred[v])
+            while u != v:
+                cycle.append(u)
+                u = int(pred[u])
+            cycle.append(v)
+            return cycle[::-1]
+    return []
+
+
+def relax_rounds(W, d, pred, frontier=None):
+    '''Runs vectorized Bellman-Ford rounds on W, updating d
+    and pred in place.  Only the rows of the vertices in
+    frontier (all vertices if None) are relaxed in the first
+    round, and after that only the rows of the vertices that
+    changed in the previous round -- the other rows cannot
+    improve anything.
+
+    Returns a negative cycle as soon as one appears in the
+    predecessor graph, or [] once a round changes nothing.'''
+    V = len(d)
+    if frontier is None:
+        frontier = np.arange(V)
+    frontier = np.asarray(frontier, dtype=np.int64)
+    columns = np.arange(V)
+    while len(frontier) > 0:
+        M = d[frontier, None] + W[frontier]
+        best_k = np.argmin(M, axis=0)
+        best = M[best_k, columns]
+        improved = np.flatnonzero(best < d - EPS)
+        if len(improved) == 0:
+            return []
+        d[improved] = best[improved]
+        pred[improved] = frontier[best_k[improved]]
+        cycle = predecessor_cycle(pred, improved)
+        if len(cycle) > 0:
+            return cycle
+        frontier = improved
+    return []
+
+
+def gain(R, cycle):
+    '''Product of the exchange rates along the cycle.'''
+    res = 1.0
+    for i, j in zip(cycle, cycle[1:]):
+        res *= R[i][j]
+    return res
+
+
+def find_arbitrage(R, tolerance=1.0):
+    '''Given a currency exchange matrix (a list of lists or a
+    NumPy array), returns a tuple (cycle, gain) where cycle is
+    a list of currencies [i_0, i_1, ..., i_0] such that trading
+    around it multiplies the amount by gain, and each trade
+    beats the per-trade tolerance.  If there is no such cycle,
+    returns ([], 1.0).
+
+    >>> R = [[1, 2, 1], [0.5, 1, 0.6], [1, 1.5, 1]]
+    >>> find_arbitrage(R)
+    ([0, 1, 2, 0], 1.2)
+    >>> find_arbitrage(R, tolerance=1.1)
+    ([], 1.0)
+    '''
+    W = log_weights(R, tolerance)
+    V = len(W)
+    d = np.zeros(V)
+    pred = np.full(V, -1, dtype=np.int64)
+    cycle = relax_rounds(W, d, pred)
+    if len(cycle) == 0:
+        return [], 1.0
+    return cycle, float(gain(np.asarray(R, dtype=np.float64), cycle))
+
+
+class ArbitrageMonitor:
+    '''Keeps track of arbitrage opportunities while the
+    exchange rates change a few at a time.
+
+    Without a profitable cycle the distances d found by
+    Bellman-Ford are a feasible potential:
+
+        d[j] <= d[i] + W[i][j]   for all i, j.
+
+    Raising a rate lowers W[i][j], and only if that breaks the
+    inequality above do we have to do anything: d[j] is
+    lowered and the change is pushed out from j with
+    relax_rounds, touching only the rows of the vertices whose
+    potential changes.  Any new cycle goes through the edge
+    i -> j and is found when it closes up in pred.  Lowering a
+    rate keeps d feasible, so it costs O(1) (we only drop the
+    edge from pred if it was there).
+
+    While there is a profitable cycle, updates only matter if
+    they make that cycle unprofitable; then everything is
+    recomputed from scratch (which also finds any other cycle).
+
+    on_cycle(cycle, gain) is called when a cycle appears (or
+    is replaced by another one after a recompute), and
+    on_clear() when the last one disappears.
+
+    >>> R = [[1, 2, 1], [0.5, 1, 0.5], [1, 2, 1]]
+    >>> m = ArbitrageMonitor(R, on_cycle=lambda c, g: print(c, g),
+    ...                      on_clear=lambda: print("clear"))
+    >>> m.update(1, 2, 0.6)
+    [2, 1, 2] 1.2
+    >>> m.update_many([(1, 2, 0.55), (2, 1, 1.5)])
+    [0, 1, 2, 0] 1.1
+    >>> m.update(1, 2, 0.5)
+    clear
+    >>> m.cycle
+    []
+    '''
+
+    def __init__(self, R, tolerance=1.0, on_cycle=None, on_clear=None):
+        self.R = np.array(R, dtype=np.float64)
+        self.tolerance = tolerance
+        self.on_cycle = on_cycle
+        self.on_clear = on_clear
+        self.W = log_weights(self.R, tolerance)
+        self.cycle = []
+        self._recompute()
+
+    def gain(self):
+        '''Gain of the current cycle, or 1.0 if there is none.'''
+        if len(self.cycle) == 0:
+            return 1.0
+        return float(gain(self.R, self.cycle))
+
+    def update(self, i, j, rate):
+        self.update_many([(i, j, rate)])
+
+    def update_many(self, updates):
+        '''Applies an iterable of (i, j, rate) updates and
+        rechecks once for the whole batch.'''
+        R, W, pred = self.R, self.W, self.pred
+        log_tolerance = np.log(self.tolerance)
+        lowered = []
+        raised = False
+        for i, j, rate in updates:
+            R[i, j] = rate
+            if i == j:
+                continue
+            old = W[i, j]
+            with np.errstate(divide="ignore"):
+                W[i, j] = log_tolerance - np.log(rate)
+            if W[i, j] < old:
+                lowered.append((i, j))
+            elif W[i, j] > old:
+                raised = True
+                # Cycles in pred are only guaranteed to be negative
+                # if d[j] >= d[i] + W[i][j] for every edge in pred.
+                if pred[j] == i:
+                    pred[j] = -1
+
+        if len(self.cycle) > 0:
+            if raised and self._cycle_weight() >= -EPS:
+                self._recompute()
+            return
+
+        d = self.d
+        frontier = []
+        for i, j in lowered:
+            if d[i] + W[i, j] < d[j] - EPS:
+                d[j] = d[i] + W[i, j]
+                pred[j] = i
+                frontier.append(j)
+        if len(frontier) == 0:
+            return
+        cycle = predecessor_cycle(pred, frontier)
+        if len(cycle) == 0:
+            cycle = relax_rounds(W, d, pred, frontier)
+        self._set_cycle(cycle)
+
+    def _cycle_weight(self):
+        cycle = self.cycle
+        return sum(self.W[i, j] for i, j in zip(cycle, cycle[1:]))
+
+    def _recompute(self):
+        V = len(self.W)
+        self.d = np.zeros(V)
+        self.pred = np.full(V, -1, dtype=np.int64)
+        self._set_cycle(relax_rounds(self.W, self.d, self.pred))
+
+    def _set_cycle(self, cycle):
+        old = self.cycle
+        self.cycle = cycle
+        if len(cycle) > 0 and cycle != old:
+            if self.on_cycle is not None:
+                self.on_cycle(cycle, self.gain())
+        elif len(cycle) == 0 and len(old) > 0:
+            if self.on_clear is not None:
+                self.on_clear()
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
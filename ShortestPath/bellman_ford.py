@@ -1,4 +1,8 @@
-def bellman_ford(G, weights, s):
+import collections
+from array import array
+
+
+def bellman_ford(G, weights, s, stats=None):
     '''Finds a minimum path tree of the directed 
     graph given as an adjacency dictionary, 
     rooted at s.  
@@ -17,6 +21,10 @@ def bellman_ford(G, weights, s):
 
     If there is a negative cycle reachable from s, 
     returns a tuple of empty dictionaries.
+
+    If stats is given (a collections.Counter, say)
+    the operation counts are added to it, see
+    Benchmarks/stats.py.
     '''
 
     INF = float("inf")
@@ -28,22 +36,280 @@ def bellman_ford(G, weights, s):
     min_path_tree = {}
     V = len(G.keys())
 
-    for _ in range(V-1):
+    improvements = 0
+    last_change = -1
+    for i in range(V-1):
         for u in G.keys():
             for v in G[u]:
                 relaxed = d[u] + weights[(u, v)]
                 if relaxed < d[v]:
                     d[v] = relaxed
                     min_path_tree[v] = u
+                    improvements += 1
+                    last_change = i
+
+    if stats is not None:
+        E = sum(len(G[u]) for u in G.keys())
+        stats["bellman_ford_passes"] += V - 1
+        stats["bellman_ford_converged"] += last_change + 2
+        stats["relaxations"] += (V - 1) * E
+        stats["improvements"] += improvements
 
     # Check for negative cycles.
-    for v in G.keys():
-        for u in G[v]:
+    for u in G.keys():
+        for v in G[u]:
             if d[u] + weights[(u, v)] < d[v]:
                 return {}, {}
 
     return d, min_path_tree
 
+
+def bellman_ford_csr(C, s):
+    '''Same as bellman_ford but on a CSRGraph.
+
+    Returns a tuple of two arrays indexed by vertex
+    index: the distances, and the predecessor index
+    in a minimum path tree (-1 for s and for vertices
+    not reachable from s).
+
+    If there is a negative cycle reachable from s,
+    returns a tuple of empty arrays.
+    '''
+
+    INF = float("inf")
+    offsets, targets, weights = C.offsets, C.targets, C.weights
+    V = len(C)
+
+    d = array('d', [INF]) * V
+    d[C.index[s]] = 0
+    min_path_tree = array('q', [-1]) * V
+
+    for _ in range(V-1):
+        for u in range(V):
+            du = d[u]
+            if du == INF:
+                continue
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                relaxed = du + weights[k]
+                if relaxed < d[v]:
+                    d[v] = relaxed
+                    min_path_tree[v] = u
+
+    for u in range(V):
+        for k in range(offsets[u], offsets[u + 1]):
+            if d[u] + weights[k] < d[targets[k]]:
+                return array('d'), array('q')
+
+    return d, min_path_tree
+
+
+# The variants below return the same (d, min_path_tree) tuple
+# as bellman_ford when there is no negative cycle reachable
+# from s.  When there is one, they return (None, cycle) where
+# cycle = [v_0, v_1, ..., v_k, v_0] lists the vertices of a
+# negative cycle in edge order.
+#
+# Any cycle in the predecessor graph (the edges
+# (min_path_tree[v], v)) has negative weight, and if a negative
+# cycle is reachable from s then, since the distances keep
+# decreasing, the predecessor graph eventually contains one.
+# So once relaxations go on for longer than they can on a graph
+# without negative cycles, we look for a cycle in the
+# predecessor graph (and keep relaxing until there is one).
+
+
+def _predecessor_cycle(min_path_tree, starts):
+    '''Returns a cycle of the predecessor graph reached by
+    walking back from one of starts, or None.'''
+    walked = {}
+    for walk, root in enumerate(starts):
+        v = root
+        while v is not None and v not in walked:
+            walked[v] = walk
+            v = min_path_tree.get(v)
+        if v is not None and walked[v] == walk:
+            cycle = [v]
+            u = min_path_tree[v]
+            while u != v:
+                cycle.append(u)
+                u = min_path_tree[u]
+            cycle.append(v)
+            return cycle[::-1]
+    return None
+
+
+# Bellman-Ford that stops as soon as a pass changes nothing.
+# O(kE) time where k <= V is the number of passes, O(V) space.
+def bellman_ford_early_exit(G, weights, s, stats=None):
+    INF = float("inf")
+    d = {v: INF for v in G.keys()}
+    d[s] = 0
+
+    min_path_tree = {}
+    V = len(G.keys())
+
+    passes = 0
+    relaxations = 0
+    improvements = 0
+    while True:
+        changed = []
+        for u in G.keys():
+            du = d[u]
+            if du == INF:
+                continue
+            relaxations += len(G[u])
+            for v in G[u]:
+                relaxed = du + weights[(u, v)]
+                if relaxed < d[v]:
+                    d[v] = relaxed
+                    min_path_tree[v] = u
+                    changed.append(v)
+        passes += 1
+        improvements += len(changed)
+
+        if len(changed) == 0:
+            res = d, min_path_tree
+            break
+        if passes >= V:
+            cycle = _predecessor_cycle(min_path_tree, changed)
+            if cycle is not None:
+                res = None, cycle
+                break
+
+    if stats is not None:
+        stats["bellman_ford_passes"] += passes
+        stats["bellman_ford_converged"] += passes
+        stats["relaxations"] += relaxations
+        stats["improvements"] += improvements
+    return res
+
+
+# Queue-based Bellman-Ford (SPFA): only the out-edges of
+# vertices whose distance changed since they were last scanned
+# are relaxed.  Every V improvements the predecessor graph is
+# checked for a cycle, which costs O(V) and so at most doubles
+# the work.
+# O(VE) time in the worst case but usually close to O(E),
+# O(V) space.
+def spfa(G, weights, s, stats=None):
+    INF = float("inf")
+    d = {v: INF for v in G.keys()}
+    d[s] = 0
+
+    min_path_tree = {}
+    V = len(G.keys())
+
+    q = collections.deque([s])
+    in_queue = {s}
+    improvements = 0
+    relaxations = 0
+    pops = 0
+    cycle = None
+    while len(q) > 0 and cycle is None:
+        u = q.popleft()
+        in_queue.remove(u)
+        pops += 1
+        relaxations += len(G[u])
+        du = d[u]
+        for v in G[u]:
+            relaxed = du + weights[(u, v)]
+            if relaxed < d[v]:
+                d[v] = relaxed
+                min_path_tree[v] = u
+                if v not in in_queue:
+                    in_queue.add(v)
+                    q.append(v)
+
+                improvements += 1
+                if improvements % V == 0:
+                    cycle = _predecessor_cycle(min_path_tree, [v])
+                    if cycle is not None:
+                        break
+
+    if stats is not None:
+        stats["queue_pops"] += pops
+        stats["relaxations"] += relaxations
+        stats["improvements"] += improvements
+    if cycle is not None:
+        return None, cycle
+    return d, min_path_tree
+
+
+# Yen's improvement.  Number the vertices in the order of
+# G.keys() and split the edges into those going forward
+# (u before v) and backward (u after v).  Each pass relaxes
+# the forward edges in increasing order of u and then the
+# backward edges in decreasing order of u.  Then a shortest
+# path with k changes of direction is found within k/2 + 1
+# passes, so ceil(V/2) passes suffice when there is no
+# negative cycle (instead of V - 1), and we still stop early
+# once a pass changes nothing.  Self-loops count as forward
+# edges, so that a negative one is found like any other cycle.
+# O(VE/2) time in the worst case, O(V + E) space.
+def bellman_ford_yen(G, weights, s, stats=None):
+    '''
+    >>> G = {0: [1], 1: [1]}
+    >>> bellman_ford_yen(G, {(0, 1): 1, (1, 1): -1}, 0)
+    (None, [1, 1])
+    >>> bellman_ford_yen(G, {(0, 1): 1, (1, 1): 0}, 0)
+    ({0: 0, 1: 1}, {1: 0})
+    '''
+    INF = float("inf")
+    order = list(G.keys())
+    position = {v: i for i, v in enumerate(order)}
+
+    forward = {}
+    backward = {}
+    for u in order:
+        forward[u] = [v for v in G[u] if position[v] >= position[u]]
+        backward[u] = [v for v in G[u] if position[v] < position[u]]
+
+    d = {v: INF for v in order}
+    d[s] = 0
+
+    min_path_tree = {}
+    V = len(order)
+    max_passes = (V + 1) // 2
+
+    passes = 0
+    relaxations = 0
+    improvements = 0
+    while True:
+        changed = []
+        for vertices, edges in ((order, forward),
+                                (reversed(order), backward)):
+            for u in vertices:
+                du = d[u]
+                if du == INF:
+                    continue
+                relaxations += len(edges[u])
+                for v in edges[u]:
+                    relaxed = du + weights[(u, v)]
+                    if relaxed < d[v]:
+                        d[v] = relaxed
+                        min_path_tree[v] = u
+                        changed.append(v)
+        passes += 1
+        improvements += len(changed)
+
+        if len(changed) == 0:
+            res = d, min_path_tree
+            break
+        if passes > max_passes:
+            cycle = _predecessor_cycle(min_path_tree, changed)
+            if cycle is not None:
+                res = None, cycle
+                break
+
+    if stats is not None:
+        stats["bellman_ford_passes"] += passes
+        stats["bellman_ford_converged"] += passes
+        stats["relaxations"] += relaxations
+        stats["improvements"] += improvements
+    return res
+
+
 # Variations:
 #
 # - You may know that there are no negative cycles
@@ -69,9 +335,15 @@ def bellman_ford(G, weights, s):
 #
 # - One potential optimization is to check mark
 #   if d has changed in each pass and return if
-#   it has not.
+#   it has not (bellman_ford_early_exit above, and
+#   spfa which only rescans vertices that changed).
 #
 # - There are other potential optimizations based
 #   on ordering the edges in certain ways that
 #   decrease the necessary number of passes
-#   (e.g., Yen's optimiation).
+#   (e.g., Yen's optimiation, bellman_ford_yen above).
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
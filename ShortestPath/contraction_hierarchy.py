@@ -0,0 +1,386 @@
+'''
+    Contraction hierarchies (Geisberger, Sanders, Schultes and
+    Delling), for fast point-to-point queries on road networks.
+
+    Preprocessing: the vertices are removed ("contracted") one
+    at a time, least important first.  Removing v would break
+    shortest paths u -> v -> w, so for every such pair of
+    remaining neighbours a shortcut edge u -> w of weight
+    w(u, v) + w(v, w) is added, unless a witness search (a
+    small Dijkstra from u that avoids v) finds a path that is
+    no longer.  The witness search is bounded in the vertices
+    it settles and the edges on its paths, and stops as soon
+    as every w is settled.  The importance of v is its edge
+    difference: the number of shortcuts it would need minus
+    the number of edges it removes, plus the number of its
+    neighbours that are already contracted (to spread the
+    contraction evenly).  The priorities change as the graph
+    changes, so they are updated lazily: the vertex on top of
+    the heap is rescored, and put back if it is no longer the
+    smallest.  Scoring uses much tighter witness limits than
+    the contraction itself, as a priority only has to be
+    roughly right.  The rank of a vertex is its position in
+    the contraction order.
+
+    Every edge of the graph, original or shortcut, joins a
+    lower ranked to a higher ranked vertex.  The upward edges
+    u -> w (rank[u] < rank[w]) are stored at u, the downward
+    edges u -> w (rank[u] > rank[w]) are stored reversed at w,
+    each in CSR form (see csr.py) with the middle vertex of a
+    shortcut, or -1 for an original edge.
+
+    Query: every shortest path can be replaced by one that goes
+    only up and then only down in rank, so a bidirectional
+    Dijkstra that only follows upward edges from s and only
+    reversed downward edges from t finds it.  Both searches
+    stay in the few vertices above s and t.  A search also
+    "stalls" at a vertex u that it can reach more cheaply
+    through an edge down from a vertex above u, and does not
+    follow the edges of u, which roughly halves the vertices
+    settled.  The shortcuts on the path found are then
+    unpacked recursively into original edges, and the distance
+    is summed along those edges in order, exactly as Dijkstra
+    sums it.  So the distances are the same as dijkstra_heap's
+    whenever sums of weights are exact (integers, or floats
+    with few significant bits); with general floats two paths
+    of the same length can round differently, and the one
+    found may be off in the last bit.
+
+    A hierarchy can be saved as a binary file of flat arrays
+    (see save), which load memory-maps without reading it.
+
+    Graphs given as adjacency list with a separate dictionary
+    of non-negative weights, as in dijkstra.py.
+'''
+
+import heapq
+import mmap
+import struct
+from array import array
+
+from csr import CSRGraph
+
+# Magic, number of vertices, number of upward and downward edges.
+HEADER = struct.Struct('<4s4xqqq')
+MAGIC = b'CH01'
+
+
+def _witness(out, u, v, targets, bound, limit, hops):
+    '''Dijkstra from u in the graph out without v.  Stops once
+    every vertex of targets is settled, after settling limit
+    vertices, or past bound, and follows paths of at most hops
+    edges.'''
+    INF = float("inf")
+    d = {u: 0}
+    h = [(0, 0, u)]
+    left = len(targets)
+    while len(h) > 0 and limit > 0:
+        priority, k, x = heapq.heappop(h)
+        if priority > bound:
+            break
+        if d[x] < priority:
+            continue
+        limit -= 1
+        if x in targets:
+            left -= 1
+            if left == 0:
+                break
+        if k == hops:
+            continue
+        k += 1
+        for y, w in out[x].items():
+            relaxed = priority + w
+            if y != v and relaxed < d.get(y, INF):
+                d[y] = relaxed
+                heapq.heappush(h, (relaxed, k, y))
+    return d
+
+
+def _shortcuts(out, inn, v, limit, hops):
+    '''Returns the shortcuts (u, w, weight) needed to
+    contract v.  A bounded witness search can miss a witness
+    and add a shortcut that is not needed, which costs space
+    but never a wrong distance.'''
+    INF = float("inf")
+    res = []
+    for u, wu in inn[v].items():
+        # A direct edge u -> w is a witness of one hop.
+        out_u = out[u]
+        via = {w: wu + ww for w, ww in out[v].items()
+               if w != u and out_u.get(w, INF) > wu + ww}
+        if len(via) == 0:
+            continue
+        d = _witness(out, u, v, via, max(via.values()), limit, hops)
+        for w, weight in via.items():
+            if d.get(w, INF) > weight:
+                res.append((u, w, weight))
+    return res
+
+
+def _csr(lists):
+    offsets = array('q', [0])
+    targets = array('i')
+    weights = array('d')
+    middle = array('i')
+    for edges in lists:
+        for target, weight, mid in edges:
+            targets.append(target)
+            weights.append(weight)
+            middle.append(mid)
+        offsets.append(len(targets))
+    return offsets, targets, weights, middle
+
+
+class ContractionHierarchy:
+    '''
+    >>> G = {0: [1, 2], 1: [3], 2: [3], 3: [4], 4: []}
+    >>> weights = {(0, 1): 1, (0, 2): 4, (1, 3): 5, (2, 3): 1,
+    ...            (3, 4): 2}
+    >>> H = ContractionHierarchy.from_dict(G, weights)
+    >>> H.query(0, 4)
+    (7.0, [0, 2, 3, 4])
+    >>> H.query(4, 0)
+    (inf, [])
+    '''
+
+    def __init__(self, labels, rank, up, down):
+        '''up and down are tuples (offsets, targets, weights,
+        middle) of the upward edges and the reversed downward
+        edges.'''
+        self.labels = labels
+        self.index = {v: i for i, v in enumerate(labels)}
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self._mmap = None
+
+    def __len__(self):
+        return len(self.labels)
+
+    @classmethod
+    def from_dict(cls, G, weights, witness_limit=200, hop_limit=10,
+                  order_limit=32, order_hops=3):
+        '''Contracts the graph G.  witness_limit and hop_limit
+        bound the vertices settled by each witness search and
+        the edges on its paths; smaller limits preprocess faster
+        but add more shortcuts.  The priorities are computed
+        with the smaller order_limit and order_hops, since they
+        only have to rank the vertices roughly.'''
+        INF = float("inf")
+        C = CSRGraph.from_dict(G, weights)
+        V = len(C)
+        out = [{} for _ in range(V)]
+        inn = [{} for _ in range(V)]
+        for u in range(V):
+            for k in range(C.offsets[u], C.offsets[u + 1]):
+                v = C.targets[k]
+                w = C.weights[k]
+                if u != v and w < out[u].get(v, INF):
+                    out[u][v] = w
+                    inn[v][u] = w
+
+        middle = {}
+        deleted = array('i', [0]) * V
+        rank = array('i', [0]) * V
+        up = [[] for _ in range(V)]
+        down = [[] for _ in range(V)]
+
+        def priority(v, shortcuts):
+            return (len(shortcuts) - len(out[v]) - len(inn[v])
+                    + deleted[v])
+
+        h = [(priority(v, _shortcuts(out, inn, v, order_limit, order_hops)),
+              v) for v in range(V)]
+        heapq.heapify(h)
+        r = 0
+        while len(h) > 0:
+            _, v = heapq.heappop(h)
+            p = priority(v, _shortcuts(out, inn, v, order_limit, order_hops))
+            if len(h) > 0 and p > h[0][0]:
+                heapq.heappush(h, (p, v))
+                continue
+            shortcuts = _shortcuts(out, inn, v, witness_limit, hop_limit)
+
+            rank[v] = r
+            r += 1
+            for w, weight in out[v].items():
+                up[v].append((w, weight, middle.pop((v, w), -1)))
+                del inn[w][v]
+                deleted[w] += 1
+            for u, weight in inn[v].items():
+                down[v].append((u, weight, middle.pop((u, v), -1)))
+                del out[u][v]
+                deleted[u] += 1
+            out[v] = inn[v] = None
+
+            for u, w, weight in shortcuts:
+                if weight < out[u].get(w, INF):
+                    out[u][w] = weight
+                    inn[w][u] = weight
+                    middle[(u, w)] = v
+
+        return cls(C.labels, rank, _csr(up), _csr(down))
+
+    def save(self, path):
+        '''Writes the hierarchy to a binary file.  The vertex
+        labels must be integers.'''
+        arrays = [array('q', self.labels), self.up[0], self.down[0],
+                  self.up[2], self.down[2], self.rank,
+                  self.up[1], self.up[3], self.down[1], self.down[3]]
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(self), len(self.up[1]),
+                                len(self.down[1])))
+            for a in arrays:
+                f.write(memoryview(a).cast('B'))
+
+    @classmethod
+    def load(cls, path):
+        '''Memory-maps a hierarchy written by save.  The
+        arrays are views of the file, valid until close.'''
+        with open(path, 'rb') as f:
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(m)
+        magic, V, n_up, n_down = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            view.release()
+            m.close()
+            raise ValueError("not a contraction hierarchy file")
+
+        pos = HEADER.size
+        parts = []
+        # 8-byte arrays first, so every array is aligned.
+        for fmt, n in (('q', V), ('q', V + 1), ('q', V + 1),
+                       ('d', n_up), ('d', n_down), ('i', V),
+                       ('i', n_up), ('i', n_up),
+                       ('i', n_down), ('i', n_down)):
+            size = struct.calcsize(fmt) * n
+            parts.append(view[pos:pos + size].cast(fmt))
+            pos += size
+        (labels, up_offsets, down_offsets, up_weights, down_weights,
+         rank, up_targets, up_middle, down_targets, down_middle) = parts
+
+        H = cls(labels, rank,
+                (up_offsets, up_targets, up_weights, up_middle),
+                (down_offsets, down_targets, down_weights, down_middle))
+        H._mmap = (m, view, parts)
+        return H
+
+    def close(self):
+        if self._mmap is not None:
+            m, view, parts = self._mmap
+            for part in parts:
+                part.release()
+            view.release()
+            m.close()
+            self._mmap = None
+
+    def _edge(self, a, b):
+        '''Returns (weight, middle) of the edge a -> b.  Both
+        ends of a shortcut through c rank above c, so a -> c is
+        stored at c as a downward edge, and c -> b at c as an
+        upward edge.'''
+        if self.rank[a] < self.rank[b]:
+            offsets, targets, weights, middle = self.up
+            x, y = a, b
+        else:
+            offsets, targets, weights, middle = self.down
+            x, y = b, a
+        for k in range(offsets[x], offsets[x + 1]):
+            if targets[k] == y:
+                return weights[k], middle[k]
+
+    def _unpack(self, edges):
+        '''Expands the (a, b, middle) edges into the path of
+        original edges, returning (distance, vertex indices).'''
+        path = [edges[0][0]]
+        dist = 0.0
+        stack = edges[::-1]
+        while len(stack) > 0:
+            a, b, mid = stack.pop()
+            if mid == -1:
+                dist += self._edge(a, b)[0]
+                path.append(b)
+            else:
+                stack.append((mid, b, self._edge(mid, b)[1]))
+                stack.append((a, mid, self._edge(a, mid)[1]))
+        return dist, path
+
+    # Time O((V'+E')logV') where V', E' are the vertices and
+    # edges above s and t in the hierarchy.
+    def query(self, s, t):
+        '''Returns (distance from s to t, [s, ..., t]), or
+        (inf, []) if t is not reachable from s.'''
+        INF = float("inf")
+        src, dst = self.index[s], self.index[t]
+        if src == dst:
+            return 0.0, [s]
+
+        graphs = (self.up, self.down)
+        d = ({src: 0}, {dst: 0})
+        prev = ({}, {})
+        h = ([(0, src)], [(0, dst)])
+        mu = INF
+        meet = None
+
+        while len(h[0]) > 0 or len(h[1]) > 0:
+            if len(h[1]) == 0 or (len(h[0]) > 0 and h[0][0] <= h[1][0]):
+                i = 0
+            else:
+                i = 1
+            priority, u = heapq.heappop(h[i])
+            if priority >= mu:
+                break
+            if d[i][u] < priority:
+                continue
+
+            other = d[1 - i].get(u)
+            if other is not None and priority + other < mu:
+                mu = priority + other
+                meet = u
+
+            # Stall on demand: if a higher vertex x already
+            # reached by this search has an edge down to u that
+            # is shorter, u is not on a shortest up-down path
+            # and its edges need not be followed.
+            offsets, targets, weights, _ = graphs[1 - i]
+            stalled = False
+            for k in range(offsets[u], offsets[u + 1]):
+                x = d[i].get(targets[k])
+                if x is not None and x + weights[k] < priority:
+                    stalled = True
+                    break
+            if stalled:
+                continue
+
+            offsets, targets, weights, middle = graphs[i]
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                relaxed = priority + weights[k]
+                if relaxed < d[i].get(v, INF):
+                    d[i][v] = relaxed
+                    prev[i][v] = (u, middle[k])
+                    heapq.heappush(h[i], (relaxed, v))
+
+        if meet is None:
+            return INF, []
+
+        edges = []
+        v = meet
+        while v != src:
+            u, mid = prev[0][v]
+            edges.append((u, v, mid))
+            v = u
+        edges.reverse()
+        u = meet
+        while u != dst:
+            v, mid = prev[1][u]
+            edges.append((u, v, mid))
+            u = v
+
+        dist, path = self._unpack(edges)
+        return dist, [self.labels[v] for v in path]
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,179 @@
+'''
+    Compressed sparse row (CSR) form of a weighted directed
+    graph.  The dictionary format used everywhere else in this
+    repo,
+
+        G = {0 : [1, 2],
+             1 : [2],
+             2 : []}
+        weights = {(0, 1) : 4, (0, 2) : 1, (1, 2) : 2}
+
+    costs one list per vertex plus one tuple and one dictionary
+    slot per edge, and every relaxation hashes a tuple.  Here
+    the vertices are renumbered 0, ..., V - 1 and the graph is
+    stored in three flat arrays:
+
+        offsets : V + 1 entries, the out-edges of vertex i are
+                  at positions offsets[i], ..., offsets[i+1] - 1.
+        targets : E entries, the head of each edge.
+        weights : E entries, the weight of each edge.
+
+    For the graph above (labels [0, 1, 2]):
+
+        offsets = [0, 2, 3, 3]
+        targets = [1, 2, 2]
+        weights = [4, 1, 2]
+
+    The labels list maps an index back to the original vertex
+    and the index dictionary maps a vertex to its index.  The
+    arrays are stdlib arrays, so they can be handed to NumPy
+    without a copy (see as_numpy).
+
+    The *_csr functions in dijkstra.py, bellman_ford.py,
+    MST/prim.py and TopSort/kosaraju.py all run on this type.
+'''
+
+from array import array
+
+
+class CSRGraph:
+
+    def __init__(self, labels, offsets, targets, weights):
+        self.labels = labels
+        self.index = {v: i for i, v in enumerate(labels)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_dict(cls, G, weights=None):
+        '''Builds a CSR graph from an adjacency dictionary
+        and an optional dictionary from edge pairs to
+        weights (every edge has weight 1 if not given).
+
+        Vertices that only appear as neighbors are added
+        after the keys of G.
+
+        O(V + E) time, O(V + E) space.
+
+        >>> C = CSRGraph.from_dict({0: [1, 2], 1: [2], 2: []},
+        ...                        {(0, 1): 4, (0, 2): 1, (1, 2): 2})
+        >>> list(C.offsets), list(C.targets), list(C.weights)
+        ([0, 2, 3, 3], [1, 2, 2], [4.0, 1.0, 2.0])
+        '''
+        labels = list(G.keys())
+        index = {v: i for i, v in enumerate(labels)}
+        for u in G.keys():
+            for v in G[u]:
+                if v not in index:
+                    index[v] = len(labels)
+                    labels.append(v)
+
+        offsets = array('q', [0])
+        targets = array('i')
+        w = array('d')
+        for u in labels:
+            for v in G.get(u, ()):
+                targets.append(index[v])
+                w.append(1.0 if weights is None else weights[(u, v)])
+            offsets.append(len(targets))
+        return cls(labels, offsets, targets, w)
+
+    @classmethod
+    def from_edges(cls, V, edges):
+        '''Builds a CSR graph on the vertices 0, ..., V - 1
+        from an iterable of (u, v, weight) triples, using a
+        counting sort on the tails so no per-vertex lists
+        are created.
+
+        O(V + E) time, O(V + E) space.
+
+        >>> C = CSRGraph.from_edges(3, [(1, 2, 2.0), (0, 1, 4.0)])
+        >>> list(C.offsets), list(C.targets)
+        ([0, 1, 2, 2], [1, 2])
+        '''
+        tails = array('i')
+        heads = array('i')
+        ws = array('d')
+        for u, v, weight in edges:
+            tails.append(u)
+            heads.append(v)
+            ws.append(weight)
+
+        offsets = array('q', bytes(8 * (V + 1)))
+        for u in tails:
+            offsets[u + 1] += 1
+        for i in range(V):
+            offsets[i + 1] += offsets[i]
+
+        nxt = array('q', offsets[:V])
+        targets = array('i', bytes(4 * len(tails)))
+        w = array('d', bytes(8 * len(tails)))
+        for k in range(len(tails)):
+            u = tails[k]
+            pos = nxt[u]
+            targets[pos] = heads[k]
+            w[pos] = ws[k]
+            nxt[u] = pos + 1
+        return cls(list(range(V)), offsets, targets, w)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def num_edges(self):
+        return len(self.targets)
+
+    def edges(self, i):
+        '''Iterates over (target, weight) pairs of the
+        out-edges of the vertex with index i.'''
+        targets, weights = self.targets, self.weights
+        for k in range(self.offsets[i], self.offsets[i + 1]):
+            yield targets[k], weights[k]
+
+    def reverse(self):
+        '''Returns the CSR graph with every edge reversed.
+        O(V + E) time, O(V + E) space.'''
+        V = len(self)
+        offsets, targets = self.offsets, self.targets
+        r_offsets = array('q', bytes(8 * (V + 1)))
+        for v in targets:
+            r_offsets[v + 1] += 1
+        for i in range(V):
+            r_offsets[i + 1] += r_offsets[i]
+
+        nxt = array('q', r_offsets[:V])
+        r_targets = array('i', bytes(4 * len(targets)))
+        r_weights = array('d', bytes(8 * len(targets)))
+        for u in range(V):
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                pos = nxt[v]
+                r_targets[pos] = u
+                r_weights[pos] = self.weights[k]
+                nxt[v] = pos + 1
+        return CSRGraph(self.labels, r_offsets, r_targets, r_weights)
+
+    def to_dict(self):
+        '''Returns the (G, weights) dictionary form.'''
+        labels = self.labels
+        G = {}
+        weights = {}
+        for u in range(len(self)):
+            G[labels[u]] = []
+            for v, weight in self.edges(u):
+                G[labels[u]].append(labels[v])
+                weights[(labels[u], labels[v])] = weight
+        return G, weights
+
+    def as_numpy(self):
+        '''Returns (offsets, targets, weights) as NumPy
+        arrays sharing memory with this graph.'''
+        import numpy as np
+        return (np.frombuffer(self.offsets, dtype=np.int64),
+                np.frombuffer(self.targets, dtype=np.int32),
+                np.frombuffer(self.weights, dtype=np.float64))
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
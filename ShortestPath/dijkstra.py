@@ -1,4 +1,8 @@
-from collections import heapq
+import collections
+import heapq
+from array import array
+
+from heaps import RadixHeap
 
 # Simplest implementation without a heap.
 
@@ -58,20 +62,34 @@ Notes:
 # Min-heap implementation.
 # Time O((V+E)logE) = O((V+E)logV), space O(V + E).
 
-def dijkstra_heap(G, weights, s):
+def dijkstra_heap(G, weights, s, queue=None, stats=None):
     '''Finds the distance from s to all vertices
     in the weighted directed graph G (given as
     a dictionary representing the adjacency lists).
 
     The edge weights must all be non-negative.  
+
+    By default a heapq list with lazy deletion is
+    used.  queue can instead be an addressable heap
+    class from heaps.py (BinaryHeap, PairingHeap or,
+    for integer weights, RadixHeap), which uses
+    decrease-key and keeps at most V entries.
+
+    If stats is given (a collections.Counter, say)
+    the operation counts are added to it, see
+    Benchmarks/stats.py.
     '''
 
+    if queue is not None:
+        return _dijkstra_decrease_key(G, weights, s, queue, stats)
+
     INF = float("inf")
     d = {v: INF for v in G.keys()}
     d[s] = 0
 
     # min-heap of tuples
     h = [(0, s)]  # (priority, vertex)
+    pushes = 1
 
     while len(h) > 0:
         priority, u = heapq.heappop(h)
@@ -85,5 +103,192 @@ def dijkstra_heap(G, weights, s):
             if relaxed < d[v]:
                 d[v] = relaxed
                 heapq.heappush(h, (relaxed, v))
+                pushes += 1
+
+    # The counts are worked out after the search: every vertex
+    # reached is settled once and scans all its edges, and every
+    # entry pushed is popped, so only the pushes are counted in
+    # the loop.
+    if stats is not None:
+        reached = [u for u in G.keys() if d[u] != INF]
+        stats["relaxations"] += sum(len(G[u]) for u in reached)
+        stats["improvements"] += pushes - 1
+        stats["heap_pushes"] += pushes
+        stats["heap_pops"] += pushes
+        stats["stale_pops"] += pushes - len(reached)
+    return d
+
+
+# Addressable heap implementation.
+# Time O((V+E)logV) with a binary heap, space O(V).
+
+def _dijkstra_decrease_key(G, weights, s, queue, stats=None):
+    INF = float("inf")
+    d = {v: INF for v in G.keys()}
+    d[s] = 0
+
+    h = queue()
+    h.push(s, 0)
+    pushes = 1
+    decrease_keys = 0
+
+    while len(h) > 0:
+        priority, u = h.pop()
+
+        for v in G[u]:
+            relaxed = priority + weights[(u, v)]
+            if relaxed < d[v]:
+                # A vertex with a finite distance that can still
+                # be improved is in the heap.
+                if d[v] == INF:
+                    h.push(v, relaxed)
+                    pushes += 1
+                else:
+                    h.decrease_key(v, relaxed)
+                    decrease_keys += 1
+                d[v] = relaxed
+
+    if stats is not None:
+        reached = [u for u in G.keys() if d[u] != INF]
+        stats["relaxations"] += sum(len(G[u]) for u in reached)
+        stats["improvements"] += pushes - 1 + decrease_keys
+        stats["heap_pushes"] += pushes
+        stats["heap_pops"] += pushes
+        stats["decrease_keys"] += decrease_keys
+    return d
+
+
+# Min-heap implementation over a CSRGraph (see csr.py).
+# Time O((V+E)logV), space O(V) on top of the graph.
+
+def dijkstra_csr(C, s, stats=None):
+    '''Same as dijkstra_heap but on a CSRGraph.
+
+    Returns an array of distances indexed by vertex
+    index, so the distance to v is d[C.index[v]].
+    '''
+
+    INF = float("inf")
+    offsets, targets, weights = C.offsets, C.targets, C.weights
+    d = array('d', [INF]) * len(C)
+    src = C.index[s]
+    d[src] = 0
+
+    h = [(0, src)]
+    pushes = 1
+
+    while len(h) > 0:
+        priority, u = heapq.heappop(h)
+
+        if d[u] < priority:
+            continue
+
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            relaxed = priority + weights[k]
+            if relaxed < d[v]:
+                d[v] = relaxed
+                heapq.heappush(h, (relaxed, v))
+                pushes += 1
+
+    if stats is not None:
+        reached = [u for u in range(len(C)) if d[u] != INF]
+        stats["relaxations"] += sum(offsets[u + 1] - offsets[u]
+                                    for u in reached)
+        stats["improvements"] += pushes - 1
+        stats["heap_pushes"] += pushes
+        stats["heap_pops"] += pushes
+        stats["stale_pops"] += pushes - len(reached)
+    return d
+
+
+# Integer weights.
+#
+# With non-negative integer weights of at most C, a priority
+# queue can use the integer keys directly instead of comparing
+# (priority, vertex) tuples in a heap:
+#
+# - 0-1 BFS (C <= 1): a deque, with 0 weight edges pushed to
+#   the front and 1 weight edges to the back.  Time O(V + E).
+#
+# - Dial's buckets (C small): a circular array of C + 1 lists,
+#   bucket d % (C + 1) holding the vertices with tentative
+#   distance d.  All the tentative distances lie in a window
+#   of C + 1 values above the current one, so no two of them
+#   share a bucket.  Time O(E + D), D the largest distance
+#   (at most (V - 1)C).
+#
+# - Radix heap (C large): see heaps.py.  Time O(E + V log(C)).
+
+# Largest C for which Dial's buckets are used.
+DIAL_MAX_WEIGHT = 1 << 12
+
+
+def dijkstra_int(G, weights, s):
+    '''Same as dijkstra_heap, for non-negative integer
+    weights.  Chooses the queue from the largest weight.
+    '''
+    C = max(weights.values(), default=0)
+    if C <= 1:
+        return _zero_one_bfs(G, weights, s)
+    if C <= DIAL_MAX_WEIGHT:
+        return _dial(G, weights, s, C)
+    return _dijkstra_decrease_key(G, weights, s, RadixHeap)
+
+
+def _zero_one_bfs(G, weights, s):
+    INF = float("inf")
+    d = {v: INF for v in G.keys()}
+    d[s] = 0
+
+    q = collections.deque([(0, s)])
+
+    while len(q) > 0:
+        priority, u = q.popleft()
+
+        if d[u] < priority:
+            continue
+
+        for v in G[u]:
+            w = weights[(u, v)]
+            relaxed = priority + w
+            if relaxed < d[v]:
+                d[v] = relaxed
+                if w == 0:
+                    q.appendleft((relaxed, v))
+                else:
+                    q.append((relaxed, v))
+
+    return d
+
+
+def _dial(G, weights, s, C):
+    INF = float("inf")
+    d = {v: INF for v in G.keys()}
+    d[s] = 0
+
+    n = C + 1
+    buckets = [[] for _ in range(n)]
+    buckets[0].append(s)
+    pending = 1
+    current = 0
+
+    while pending > 0:
+        # 0 weight edges can add to the bucket being emptied.
+        bucket = buckets[current % n]
+        while len(bucket) > 0:
+            u = bucket.pop()
+            pending -= 1
+
+            if d[u] != current:
+                continue
+
+            for v in G[u]:
+                relaxed = current + weights[(u, v)]
+                if relaxed < d[v]:
+                    d[v] = relaxed
+                    buckets[relaxed % n].append(v)
+                    pending += 1
+        current += 1
 
     return d
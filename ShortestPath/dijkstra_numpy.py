@@ -0,0 +1,61 @@
+'''
+    Dijkstra's algorithm on a dense graph given as a V x V NumPy
+    weight matrix W, with W[i][j] = inf where there is no edge.
+
+    The heap-free dijkstra in dijkstra.py does O(V^2) work, which
+    is the right complexity for complete graphs and distance
+    matrices, but it does it one Python operation at a time.
+    Here the distances and the visited mask are arrays, so each
+    of the V steps is one vectorized argmin and one vectorized
+    relaxation of the row W[u].
+
+    O(V^2) time (in V vectorized steps), O(V) space on top of W.
+'''
+
+import numpy as np
+
+
+def dijkstra_dense(W, s):
+    '''Returns a tuple (d, pred) of arrays: the distances from
+    s to every vertex, and the predecessor of every vertex in
+    a minimum path tree (-1 for s and unreachable vertices).
+    The weights must all be non-negative.
+
+    >>> inf = float("inf")
+    >>> W = [[inf, 1, 4], [inf, inf, 2], [inf, inf, inf]]
+    >>> d, pred = dijkstra_dense(W, 0)
+    >>> d.tolist(), pred.tolist()
+    ([0.0, 1.0, 3.0], [-1, 0, 1])
+    '''
+    W = np.asarray(W, dtype=np.float64)
+    V = len(W)
+    INF = np.inf
+
+    d = np.full(V, INF)
+    pred = np.full(V, -1, dtype=np.int64)
+    done = np.zeros(V, dtype=bool)
+    # Tentative distances of the vertices not yet done, and inf
+    # for the others, so the next vertex is a plain argmin.
+    frontier = np.full(V, INF)
+    frontier[s] = 0
+
+    for _ in range(V):
+        u = int(np.argmin(frontier))
+        du = frontier[u]
+        if du == INF:
+            break
+        d[u] = du
+        done[u] = True
+        frontier[u] = INF
+
+        relaxed = du + W[u]
+        better = (relaxed < frontier) & ~done
+        frontier[better] = relaxed[better]
+        pred[better] = u
+
+    return d, pred
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
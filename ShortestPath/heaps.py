@@ -0,0 +1,247 @@
+'''
+    Addressable priority queues with a true decrease-key.
+
+    dijkstra_heap and prim_heap use lazy deletion by default:
+    every improvement pushes a new (priority, vertex) tuple on
+    a heapq list and stale entries are skipped when popped, so
+    the heap can grow to O(E) entries.  The queues below keep
+    one entry per item, so the queue never holds more than V
+    entries.  Pass one of the classes as the queue parameter:
+
+        dijkstra_heap(G, weights, s, queue=BinaryHeap)
+        prim_heap(G, weights, queue=PairingHeap)
+
+    All of them share the interface
+
+        push(item, priority)
+        decrease_key(item, priority)
+        pop() -> (priority, item)
+        len(h), item in h
+
+    BinaryHeap     : O(log n) push, pop and decrease_key.
+    PairingHeap    : O(1) push and decrease_key (amortized
+                     o(log n)), O(log n) amortized pop.
+    RadixHeap      : Non-negative integer priorities only and
+                     monotone use (never push a priority smaller
+                     than the last one popped), as in Dijkstra
+                     with integer weights.  O(log C) amortized
+                     per item where C is the largest weight.
+                     Not suitable for Prim.
+'''
+
+
+# Position-indexed binary min-heap.
+class BinaryHeap:
+
+    def __init__(self):
+        self.items = []
+        self.priorities = []
+        self.pos = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.pos
+
+    def push(self, item, priority):
+        self.items.append(item)
+        self.priorities.append(priority)
+        self.pos[item] = len(self.items) - 1
+        self._sift_up(len(self.items) - 1)
+
+    def decrease_key(self, item, priority):
+        i = self.pos[item]
+        self.priorities[i] = priority
+        self._sift_up(i)
+
+    def pop(self):
+        items, priorities = self.items, self.priorities
+        priority, item = priorities[0], items[0]
+        del self.pos[item]
+        last_item = items.pop()
+        last_priority = priorities.pop()
+        if len(items) > 0:
+            items[0] = last_item
+            priorities[0] = last_priority
+            self.pos[last_item] = 0
+            self._sift_down(0)
+        return priority, item
+
+    def _sift_up(self, i):
+        items, priorities, pos = self.items, self.priorities, self.pos
+        item, priority = items[i], priorities[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if priorities[parent] <= priority:
+                break
+            items[i] = items[parent]
+            priorities[i] = priorities[parent]
+            pos[items[i]] = i
+            i = parent
+        items[i] = item
+        priorities[i] = priority
+        pos[item] = i
+
+    def _sift_down(self, i):
+        items, priorities, pos = self.items, self.priorities, self.pos
+        n = len(items)
+        item, priority = items[i], priorities[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and priorities[child + 1] < priorities[child]:
+                child += 1
+            if priority <= priorities[child]:
+                break
+            items[i] = items[child]
+            priorities[i] = priorities[child]
+            pos[items[i]] = i
+            i = child
+        items[i] = item
+        priorities[i] = priority
+        pos[item] = i
+
+
+class _PairingNode:
+
+    __slots__ = ("item", "priority", "child", "sibling", "prev")
+
+    def __init__(self, item, priority):
+        self.item = item
+        self.priority = priority
+        self.child = None
+        self.sibling = None
+        # Parent if this is the leftmost child, otherwise
+        # the left sibling.
+        self.prev = None
+
+
+# Pairing min-heap (two-pass variant).
+class PairingHeap:
+
+    def __init__(self):
+        self.root = None
+        self.nodes = {}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, item):
+        return item in self.nodes
+
+    @staticmethod
+    def _meld(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b.priority < a.priority:
+            a, b = b, a
+        # b becomes the leftmost child of a.
+        b.prev = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        a.sibling = None
+        a.prev = None
+        return a
+
+    def push(self, item, priority):
+        node = _PairingNode(item, priority)
+        self.nodes[item] = node
+        self.root = self._meld(self.root, node)
+
+    def decrease_key(self, item, priority):
+        node = self.nodes[item]
+        node.priority = priority
+        if node is self.root:
+            return
+        # Cut the subtree rooted at node and meld it with the root.
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.sibling = None
+        node.prev = None
+        self.root = self._meld(self.root, node)
+
+    def pop(self):
+        root = self.root
+        del self.nodes[root.item]
+
+        # First pass: meld children in pairs from left to right.
+        pairs = []
+        node = root.child
+        while node is not None:
+            a = node
+            b = node.sibling
+            node = b.sibling if b is not None else None
+            a.sibling = a.prev = None
+            if b is not None:
+                b.sibling = b.prev = None
+            pairs.append(self._meld(a, b))
+
+        # Second pass: meld the pairs from right to left.
+        new_root = None
+        for tree in reversed(pairs):
+            new_root = self._meld(tree, new_root)
+        self.root = new_root
+        return root.priority, root.item
+
+
+# Radix heap for monotone non-negative integer priorities.
+class RadixHeap:
+
+    def __init__(self):
+        # Bucket 0 holds priorities equal to last, bucket
+        # i > 0 holds priorities p with the highest bit in
+        # which p and last differ equal to i - 1.
+        self.buckets = [{}]
+        self.where = {}
+        self.last = 0
+
+    def __len__(self):
+        return len(self.where)
+
+    def __contains__(self, item):
+        return item in self.where
+
+    def _bucket(self, priority):
+        return (priority ^ self.last).bit_length()
+
+    def push(self, item, priority):
+        if priority < self.last:
+            raise ValueError("priority below the last popped priority")
+        b = self._bucket(priority)
+        while len(self.buckets) <= b:
+            self.buckets.append({})
+        self.buckets[b][item] = priority
+        self.where[item] = b
+
+    def decrease_key(self, item, priority):
+        del self.buckets[self.where[item]][item]
+        self.push(item, priority)
+
+    def pop(self):
+        buckets = self.buckets
+        if len(buckets[0]) == 0:
+            i = 1
+            while len(buckets[i]) == 0:
+                i += 1
+            # Redistribute the first non-empty bucket around
+            # its minimum; every item moves to a lower bucket.
+            bucket = buckets[i]
+            buckets[i] = {}
+            self.last = min(bucket.values())
+            for item, priority in bucket.items():
+                b = self._bucket(priority)
+                buckets[b][item] = priority
+                self.where[item] = b
+        item, priority = buckets[0].popitem()
+        del self.where[item]
+        return priority, item
@@ -0,0 +1,159 @@
+'''
+    Dijkstra with many sources, and many (s, t) queries on the
+    same graph.
+
+    (1) dijkstra_multi: starting Dijkstra with every source in
+    the heap at distance 0 gives, for every vertex, the distance
+    to the nearest source.  Remembering which source each label
+    came from partitions the vertices into the Voronoi cells of
+    the sources (nearest facility).  Ties are broken towards the
+    source that comes first in the list: the heap is ordered by
+    (distance, rank of the source), which is still a valid
+    Dijkstra order since the rank does not change along a path.
+
+    (2) BatchQueries: dijkstra_heap sets up a dictionary of all
+    V vertices for every call, which is most of the work when a
+    query only settles a few vertices.  Here the graph is turned
+    into a CSRGraph (csr.py) once, and the distance array is
+    allocated once and never cleared.  Each search gets a new
+    generation number instead, and d[v] only counts as set if
+    stamp[v] is the current generation, so starting a search is
+    O(1).  The queries are grouped by source, so each source is
+    searched once, stopping when all its targets are settled.
+
+    Graphs given as adjacency list with a separate dictionary
+    of weights, as in dijkstra.py.  The edge weights must all
+    be non-negative.
+'''
+
+import collections
+import heapq
+from array import array
+
+from csr import CSRGraph
+
+
+# Time O((V+E)logV), space O(V).
+def dijkstra_multi(G, weights, sources):
+    '''Returns (d, owner): d[v] is the distance from the
+    nearest source to v and owner[v] that source (inf and
+    None if no source reaches v).
+
+    >>> G = {0: [1], 1: [0, 2], 2: [1, 3], 3: [2]}
+    >>> weights = {(0, 1): 1, (1, 0): 1, (1, 2): 5, (2, 1): 5,
+    ...            (2, 3): 1, (3, 2): 1}
+    >>> d, owner = dijkstra_multi(G, weights, [0, 3])
+    >>> d
+    {0: 0, 1: 1, 2: 1, 3: 0}
+    >>> owner
+    {0: 0, 1: 0, 2: 3, 3: 3}
+    '''
+    INF = float("inf")
+    d = {v: INF for v in G.keys()}
+    owner = {v: None for v in G.keys()}
+    rank = {}
+
+    h = []
+    for s in sources:
+        if s not in rank:
+            rank[s] = len(rank)
+            d[s] = 0
+            owner[s] = s
+            h.append((0, rank[s], s))
+    heapq.heapify(h)
+
+    while len(h) > 0:
+        priority, r, u = heapq.heappop(h)
+
+        if d[u] < priority or rank[owner[u]] < r:
+            continue
+
+        for v in G[u]:
+            relaxed = priority + weights[(u, v)]
+            if relaxed < d[v] or (relaxed == d[v] and r < rank[owner[v]]):
+                d[v] = relaxed
+                owner[v] = owner[u]
+                heapq.heappush(h, (relaxed, r, v))
+
+    return d, owner
+
+
+class BatchQueries:
+    '''
+    >>> G = {0: [1, 2], 1: [3], 2: [3], 3: []}
+    >>> weights = {(0, 1): 1, (0, 2): 4, (1, 3): 5, (2, 3): 1}
+    >>> Q = BatchQueries(G, weights)
+    >>> Q.query([(0, 3), (2, 3), (0, 1), (3, 0)])
+    [5.0, 1.0, 1.0, inf]
+    '''
+
+    def __init__(self, G, weights):
+        self.graph = CSRGraph.from_dict(G, weights)
+        V = len(self.graph)
+        self.d = array('d', [0]) * V
+        self.stamp = array('q', [0]) * V
+        self.generation = 0
+
+    def _search(self, src, wanted):
+        '''Dijkstra from the vertex index src, until all the
+        vertex indices in the set wanted are settled.'''
+        C = self.graph
+        offsets, targets, weights = C.offsets, C.targets, C.weights
+        d, stamp = self.d, self.stamp
+        self.generation += 1
+        gen = self.generation
+
+        d[src] = 0
+        stamp[src] = gen
+        h = [(0, src)]
+        pending = len(wanted)
+
+        while len(h) > 0 and pending > 0:
+            priority, u = heapq.heappop(h)
+
+            if d[u] < priority:
+                continue
+            if u in wanted:
+                pending -= 1
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                relaxed = priority + weights[k]
+                if stamp[v] != gen or relaxed < d[v]:
+                    d[v] = relaxed
+                    stamp[v] = gen
+                    heapq.heappush(h, (relaxed, v))
+
+    def distances(self, s, ts):
+        '''Returns the list of distances from s to each of ts.'''
+        index = self.graph.index
+        src = index[s]
+        wanted = [index[t] for t in ts]
+        self._search(src, set(wanted))
+        INF = float("inf")
+        return [self.d[v] if self.stamp[v] == self.generation else INF
+                for v in wanted]
+
+    def query(self, pairs):
+        '''Returns the list of distances for the (s, t) pairs,
+        in the same order.'''
+        by_source = collections.defaultdict(list)
+        for i, (s, t) in enumerate(pairs):
+            by_source[s].append(i)
+
+        res = [None] * len(pairs)
+        for s, queries in by_source.items():
+            ds = self.distances(s, [pairs[i][1] for i in queries])
+            for i, dist in zip(queries, ds):
+                res[i] = dist
+        return res
+
+
+def batch_queries(G, weights, pairs):
+    '''Returns the list of distances for the (s, t) pairs.'''
+    return BatchQueries(G, weights).query(pairs)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
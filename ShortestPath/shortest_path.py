@@ -0,0 +1,187 @@
+'''
+    Point-to-point shortest paths.  dijkstra_heap computes the
+    distance from s to every vertex, but when only the distance
+    to one target t is needed we can stop as soon as t is
+    settled, since its distance can no longer change.
+
+    Three variants are given, all of which return a tuple
+
+        (distance from s to t, [s, ..., t])
+
+    or (inf, []) if t is not reachable from s.  The edge weights
+    must all be non-negative.
+
+    (1) shortest_path: Dijkstra with early exit.
+
+    (2) shortest_path_bidirectional: runs Dijkstra forward from
+    s and backward from t (over the reverse graph) at the same
+    time.  Each search only has to get about half way, which on
+    graphs that grow like a ball around a vertex (road networks,
+    grids) settles far fewer vertices.  Let mu be the length of
+    the best s-t path seen so far through an edge between the
+    two searches.  We can stop as soon as the smallest keys of
+    the two heaps sum to at least mu.
+
+    (3) shortest_path_astar: Dijkstra on the reduced priorities
+    d(v) + heuristic(v), where heuristic(v) is a lower bound on
+    the distance from v to t (e.g. the straight line distance
+    on a map).  With heuristic = 0 this is (1).  An inadmissible
+    heuristic (one that over-estimates) can give wrong answers.
+
+    Graphs given as adjacency list with a separate dictionary
+    of weights, for example:
+
+    G = {0 : [1, 2],
+         1 : [3],
+         2 : [3],
+         3 : []}
+    weights = {(0, 1) : 1, (0, 2) : 4, (1, 3) : 5, (2, 3) : 1}
+'''
+
+import collections
+import heapq
+
+
+def _path(prev, s, t):
+    path = [t]
+    while path[-1] != s:
+        path.append(prev[path[-1]])
+    return path[::-1]
+
+
+# Time O((V+E)logV), space O(V + E) -- but only the vertices
+# closer to s than t are settled.
+def shortest_path(G, weights, s, t):
+    '''
+    >>> G = {0: [1, 2], 1: [3], 2: [3], 3: []}
+    >>> weights = {(0, 1): 1, (0, 2): 4, (1, 3): 5, (2, 3): 1}
+    >>> shortest_path(G, weights, 0, 3)
+    (5, [0, 2, 3])
+    '''
+    d = {s: 0}
+    prev = {}
+    h = [(0, s)]
+
+    while len(h) > 0:
+        priority, u = heapq.heappop(h)
+
+        if d[u] < priority:
+            continue
+        if u == t:
+            return priority, _path(prev, s, t)
+
+        for v in G[u]:
+            relaxed = priority + weights[(u, v)]
+            if relaxed < d.get(v, float("inf")):
+                d[v] = relaxed
+                prev[v] = u
+                heapq.heappush(h, (relaxed, v))
+
+    return float("inf"), []
+
+
+# Time O((V+E)logV), space O(V + E).
+def shortest_path_bidirectional(G, weights, s, t, G_reverse=None):
+    '''G_reverse is the reverse adjacency dictionary of G.
+    It is built if not given; pass it in when running
+    many queries on the same graph.
+
+    >>> G = {0: [1, 2], 1: [3], 2: [3], 3: []}
+    >>> weights = {(0, 1): 1, (0, 2): 4, (1, 3): 5, (2, 3): 1}
+    >>> shortest_path_bidirectional(G, weights, 0, 3)
+    (5, [0, 2, 3])
+    '''
+    INF = float("inf")
+    if s == t:
+        return 0, [s]
+    if G_reverse is None:
+        G_reverse = collections.defaultdict(list)
+        for v in G.keys():
+            for w in G[v]:
+                G_reverse[w].append(v)
+
+    # Index 0 is the forward search, index 1 the backward one.
+    d = ({s: 0}, {t: 0})
+    prev = ({}, {})
+    h = ([(0, s)], [(0, t)])
+    adjacency = (G, G_reverse)
+
+    mu = INF
+    meet = None
+    while len(h[0]) > 0 and len(h[1]) > 0:
+        if h[0][0][0] + h[1][0][0] >= mu:
+            break
+
+        # Advance the search with the smaller heap.
+        side = 0 if len(h[0]) <= len(h[1]) else 1
+        priority, u = heapq.heappop(h[side])
+        if d[side][u] < priority:
+            continue
+
+        other = d[1 - side]
+        for v in adjacency[side][u]:
+            weight = weights[(u, v)] if side == 0 else weights[(v, u)]
+            relaxed = priority + weight
+            if relaxed < d[side].get(v, INF):
+                d[side][v] = relaxed
+                prev[side][v] = u
+                heapq.heappush(h[side], (relaxed, v))
+            if v in other and relaxed + other[v] < mu:
+                mu = relaxed + other[v]
+                # The best path uses the edge meet, whose tail is
+                # in the forward tree and head in the backward one.
+                meet = (u, v) if side == 0 else (v, u)
+
+    if meet is None:
+        return INF, []
+
+    u, v = meet
+    path = _path(prev[0], s, u)
+    # Walk the backward tree from v to t.
+    while True:
+        path.append(v)
+        if v == t:
+            break
+        v = prev[1][v]
+    return mu, path
+
+
+# Time O((V+E)logV), space O(V + E).
+def shortest_path_astar(G, weights, s, t, heuristic):
+    '''heuristic(v) must be a lower bound on the
+    distance from v to t.
+
+    >>> G = {0: [1, 2], 1: [3], 2: [3], 3: []}
+    >>> weights = {(0, 1): 1, (0, 2): 4, (1, 3): 5, (2, 3): 1}
+    >>> shortest_path_astar(G, weights, 0, 3, lambda v: 0)
+    (5, [0, 2, 3])
+    '''
+    d = {s: 0}
+    prev = {}
+    h = [(heuristic(s), s)]
+
+    while len(h) > 0:
+        priority, u = heapq.heappop(h)
+
+        du = d[u]
+        if du + heuristic(u) < priority:
+            continue
+        if u == t:
+            return du, _path(prev, s, t)
+
+        # No closed set: with an admissible but inconsistent
+        # heuristic a vertex may be improved after it is popped,
+        # in which case it is simply pushed again.
+        for v in G[u]:
+            relaxed = du + weights[(u, v)]
+            if relaxed < d.get(v, float("inf")):
+                d[v] = relaxed
+                prev[v] = u
+                heapq.heappush(h, (relaxed + heuristic(v), v))
+
+    return float("inf"), []
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,189 @@
+'''
+    Weighted critical path analysis of a DAG of jobs, a
+    generalization of longest_path_length in dfs_top_sort.py.
+
+    Every node v has a duration cost[v] and every edge u -> v
+    an optional delay edge_cost[(u, v)] (the time that has to
+    pass between the end of u and the start of v).  With the
+    nodes in topological order one forward pass gives the
+    earliest start of every node,
+
+        earliest[v] = max over edges u -> v of
+                      earliest[u] + cost[u] + edge_cost[(u, v)],
+
+    and one backward pass gives the time from the start of a
+    node to the end of the project along the longest path,
+
+        tail[u] = cost[u] + max over edges u -> v of
+                  edge_cost[(u, v)] + tail[v].
+
+    The project length is the longest earliest[v] + tail[v].
+    The latest start of v that does not delay the project is
+    length - tail[v] and its slack is latest - earliest.  The
+    critical path is made of the nodes with zero slack.
+
+    When the cost of one node changes only the earliest starts
+    of its descendants and the tails of its ancestors can change.
+    set_cost recomputes those in topological order (forward) and
+    reverse topological order (backward), and stops following a
+    branch as soon as a value stays the same.  The project length
+    is the largest finish time of a sink; those are kept in a
+    heap with lazy deletion, so an update only pushes the sinks
+    whose finish time changed instead of rescanning them all.
+
+    Graphs given as adjacency list.  For example:
+
+    G = {0 : [1,2],
+         1 : [3],
+         2 : [3],
+         3 : []}
+'''
+
+import heapq
+
+from dfs_top_sort import top_sortable
+
+
+class CriticalPath:
+    '''
+    >>> G = {0: [1, 2], 1: [3], 2: [3], 3: []}
+    >>> P = CriticalPath(G, {0: 2, 1: 4, 2: 1, 3: 3})
+    >>> P.length, P.path()
+    (9, [0, 1, 3])
+    >>> P.earliest[2], P.latest(2), P.slack(2)
+    (2, 5, 3)
+    >>> P.set_cost(2, 6)
+    >>> P.length, P.path()
+    (11, [0, 2, 3])
+    '''
+
+    def __init__(self, G, cost, edge_cost=None):
+        order = top_sortable(G)
+        if len(order) != len(G.keys()):
+            raise ValueError("G has a cycle")
+        self.G = G
+        self.cost = dict(cost)
+        self.edge_cost = {} if edge_cost is None else edge_cost
+        self.position = {v: i for i, v in enumerate(order)}
+        self.G_reverse = {v: [] for v in G.keys()}
+        for u in G.keys():
+            for v in G[u]:
+                self.G_reverse[v].append(u)
+        self.sinks = [v for v in G.keys() if len(G[v]) == 0]
+
+        self.earliest = {}
+        for v in order:
+            self.earliest[v] = self._earliest(v)
+        self.tail = {}
+        for v in reversed(order):
+            self.tail[v] = self._tail(v)
+        self._rebuild_finishes()
+
+    def _earliest(self, v):
+        cost, edge_cost, earliest = self.cost, self.edge_cost, self.earliest
+        return max((earliest[u] + cost[u] + edge_cost.get((u, v), 0)
+                    for u in self.G_reverse[v]), default=0)
+
+    def _tail(self, u):
+        edge_cost, tail = self.edge_cost, self.tail
+        return self.cost[u] + max((edge_cost.get((u, v), 0) + tail[v]
+                                   for v in self.G[u]), default=0)
+
+    def _finish(self, v):
+        return self.earliest[v] + self.cost[v]
+
+    def _rebuild_finishes(self):
+        # Max-heap of (-finish time, position, sink).  An entry
+        # is stale once the finish time of its sink has changed.
+        position = self.position
+        self._finishes = [(-self._finish(v), position[v], v)
+                          for v in self.sinks]
+        heapq.heapify(self._finishes)
+        self._update_length(())
+
+    def _update_length(self, changed):
+        # The longest path ends at a sink.
+        h = self._finishes
+        for v in changed:
+            heapq.heappush(h, (-self._finish(v), self.position[v], v))
+        while len(h) > 0 and -h[0][0] != self._finish(h[0][2]):
+            heapq.heappop(h)
+        self.length = -h[0][0] if len(h) > 0 else 0
+        # Drop the stale entries once they are the majority, so
+        # the heap stays O(number of sinks) (amortized O(1)).
+        if len(h) > 2 * len(self.sinks) + 16:
+            self._rebuild_finishes()
+
+    def latest(self, v):
+        return self.length - self.tail[v]
+
+    def slack(self, v):
+        return self.length - self.tail[v] - self.earliest[v]
+
+    def path(self):
+        '''Returns a longest (critical) path as a list of nodes.'''
+        earliest, tail, length = self.earliest, self.tail, self.length
+        current = None
+        for v in self.G.keys():
+            if earliest[v] == 0 and tail[v] == length:
+                current = v
+                break
+        if current is None:
+            return []
+        res = [current]
+        while True:
+            u = current
+            finish = earliest[u] + self.cost[u]
+            for v in self.G[u]:
+                if (finish + self.edge_cost.get((u, v), 0) == earliest[v]
+                        and earliest[v] + tail[v] == length):
+                    current = v
+                    break
+            if current == u:
+                return res
+            res.append(current)
+
+    def set_cost(self, v, c):
+        '''Changes the cost of v and updates the times of the
+        affected nodes only.'''
+        self.cost[v] = c
+        position = self.position
+
+        # Sinks whose finish time changed.
+        changed = [v] if len(self.G[v]) == 0 else []
+
+        # Forward: earliest starts of the descendants of v.
+        h = [(position[w], w) for w in self.G[v]]
+        heapq.heapify(h)
+        queued = set(self.G[v])
+        while len(h) > 0:
+            _, w = heapq.heappop(h)
+            new = self._earliest(w)
+            if new != self.earliest[w]:
+                self.earliest[w] = new
+                if len(self.G[w]) == 0:
+                    changed.append(w)
+                for x in self.G[w]:
+                    if x not in queued:
+                        queued.add(x)
+                        heapq.heappush(h, (position[x], x))
+
+        # Backward: tails of v and its ancestors.
+        h = [(-position[v], v)]
+        queued = {v}
+        while len(h) > 0:
+            _, u = heapq.heappop(h)
+            new = self._tail(u)
+            if new != self.tail[u]:
+                self.tail[u] = new
+                for x in self.G_reverse[u]:
+                    if x not in queued:
+                        queued.add(x)
+                        heapq.heappush(h, (-position[x], x))
+
+        self._update_length(changed)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
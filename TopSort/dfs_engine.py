@@ -0,0 +1,176 @@
+'''
+    Explicit-stack DFS shared by the DFS-based algorithms in
+    this directory.  The recursive versions need one Python call
+    per vertex on the current path, so a path longer than the
+    recursion limit (about 1000) raises RecursionError, and the
+    calls themselves are most of the running time.
+
+    The graph is given in compressed sparse row form over the
+    vertices 0, ..., V - 1: the out-neighbors of u are
+
+        targets[offsets[u]], ..., targets[offsets[u + 1] - 1].
+
+    index_graph converts the adjacency dictionaries used in
+    this directory to that form (a CSRGraph from
+    ShortestPath/csr.py can also be used directly).
+
+    Vertices are colored WHITE (never visited), GRAY (on the
+    DFS stack) or BLACK (finished).  The hooks are
+
+        pre(u)          : u turns GRAY.
+        post(u)         : u turns BLACK.
+        back_edge(u, v) : the edge u -> v goes to a GRAY vertex,
+                          i.e. closes a cycle.  If it returns a
+                          true value the search stops.
+
+    If stats is given (a collections.Counter, say) dfs adds to
+    it the number of vertices it visited and the largest number
+    of them on the stack at once (see Benchmarks/stats.py).
+'''
+
+import itertools
+from array import array
+
+WHITE, GRAY, BLACK = 0, 1, 2
+
+
+def index_graph(G):
+    '''Returns (labels, offsets, targets) for the adjacency
+    dictionary G.  labels[i] is the vertex with index i; the
+    keys of G come first, in order, followed by any vertices
+    that only appear as neighbors.
+
+    >>> index_graph({'a': ['b', 'c'], 'b': ['c'], 'c': []})
+    (['a', 'b', 'c'], array('q', [0, 2, 3, 3]), array('i', [1, 2, 2]))
+    >>> index_graph({0: [2], 1: [], 2: [3]})
+    ([0, 1, 2, 3], array('q', [0, 1, 1, 2, 2]), array('i', [2, 3]))
+    '''
+    labels = list(G.keys())
+    V = len(labels)
+    neighbors = list(itertools.chain.from_iterable(G.values()))
+    offsets = array('q', itertools.accumulate(map(len, G.values()),
+                                              initial=0))
+    try:
+        # The vertices are already 0, ..., V - 1, so the
+        # neighbors are their own indices and nothing has to be
+        # looked up.
+        if labels == list(range(V)) and (
+                len(neighbors) == 0
+                or (min(neighbors) >= 0 and max(neighbors) < V)):
+            return labels, offsets, array('i', neighbors)
+    except TypeError:
+        pass
+
+    index = {v: i for i, v in enumerate(labels)}
+    try:
+        # Every neighbor is a key, so both arrays can be filled
+        # without a Python level loop.
+        return labels, offsets, array('i', map(index.__getitem__,
+                                               neighbors))
+    except KeyError:
+        pass
+
+    offsets = array('q', [0])
+    targets = array('i')
+    i = 0
+    while i < len(labels):
+        for v in G.get(labels[i], ()):
+            if v not in index:
+                index[v] = len(labels)
+                labels.append(v)
+            targets.append(index[v])
+        offsets.append(len(targets))
+        i += 1
+    return labels, offsets, targets
+
+
+def reverse_graph(offsets, targets):
+    '''Returns (offsets, targets) of the graph with every edge
+    reversed.  O(V + E) time.'''
+    V = len(offsets) - 1
+    r_offsets = array('q', bytes(8 * (V + 1)))
+    for v in targets:
+        r_offsets[v + 1] += 1
+    for i in range(V):
+        r_offsets[i + 1] += r_offsets[i]
+
+    nxt = array('q', r_offsets[:V])
+    r_targets = array('i', bytes(4 * len(targets)))
+    for u in range(V):
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            r_targets[nxt[v]] = u
+            nxt[v] += 1
+    return r_offsets, r_targets
+
+
+# O(V + E) time, O(V) space.
+def dfs(offsets, targets, roots, color=None,
+        pre=None, post=None, back_edge=None, stats=None):
+    '''Runs a DFS from each WHITE vertex of roots in turn.
+
+    color is a bytearray of length V, updated in place, so a
+    later call can continue where this one stopped; a fresh
+    all-WHITE one is used if not given.
+
+    Returns False if back_edge stopped the search, else True.
+    '''
+    if color is None:
+        color = bytearray(len(offsets) - 1)
+
+    visited = 0
+    deepest = 0
+    try:
+        for root in roots:
+            if color[root] != WHITE:
+                continue
+            visited += 1
+            color[root] = GRAY
+            if pre is not None:
+                pre(root)
+
+            # u is the current vertex and k the position of its
+            # next edge; the same pair is saved on the stack for
+            # each of the ancestors of u.
+            stack = []
+            u = root
+            k = offsets[u]
+            end = offsets[u + 1]
+            while True:
+                while k < end:
+                    v = targets[k]
+                    k += 1
+                    c = color[v]
+                    if c == WHITE:
+                        stack.append((u, k, end))
+                        if len(stack) > deepest:
+                            deepest = len(stack)
+                        visited += 1
+                        color[v] = GRAY
+                        if pre is not None:
+                            pre(v)
+                        u = v
+                        k = offsets[v]
+                        end = offsets[v + 1]
+                    elif c == GRAY and back_edge is not None:
+                        if back_edge(u, v):
+                            return False
+
+                color[u] = BLACK
+                if post is not None:
+                    post(u)
+                if len(stack) == 0:
+                    break
+                u, k, end = stack.pop()
+        return True
+    finally:
+        # The stack holds the ancestors of the current vertex.
+        if stats is not None and visited > 0:
+            stats["dfs_vertices"] += visited
+            stats["dfs_max_depth"] = max(stats["dfs_max_depth"],
+                                         deepest + 1)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -49,86 +49,55 @@
          3 : []}
 '''
 
-# Imput must be a DAG.
-# Returns a topological sort of the input.
-# O(V + E) time, O(V) space.
+from array import array
 
+from dfs_engine import dfs, index_graph
 
-def top_sort(G):
-    res = []
-    visited = {k: False for k in G.keys()}
+# The functions below run on the explicit-stack DFS in
+# dfs_engine.py rather than recursive closures, so they work on
+# paths of any length.  The vertices are renumbered 0, ..., V - 1
+# first (unless they already are) and the colors kept in a
+# bytearray.  If stats is given (a collections.Counter, say)
+# the number of vertices visited and the largest stack depth
+# are added to it, see dfs_engine.py.
 
-    def go(node):
-        if visited[node]:
-            return
-        for x in G[node]:
-            go(x)
-        res.append(node)
-        visited[node] = True
 
-    for node in G.keys():
-        go(node)
-    return res[::-1]
+# Imput must be a DAG.
+# Returns a topological sort of the input.
+# O(V + E) time, O(V) space.
+def top_sort(G, stats=None):
+    labels, offsets, targets = index_graph(G)
+    res = array('i')
+    dfs(offsets, targets, range(len(labels)), post=res.append,
+        stats=stats)
+    return [labels[i] for i in reversed(res)]
 
 
 # Cycle detection.
 # # O(V + E) time, O(V) space.
-def has_cycle(G):
+def has_cycle(G, stats=None):
     # WHITE : Never visited.
     # GRAY : Currently in process, not finished.
     # BLACK : Finished.
-    WHITE, GRAY, BLACK = 0, 1, 2
-    visited = {k: WHITE for k in G.keys()}
-
-    def go(node):
-        # Returns False if we find a cycle.
-        if visited[node] == GRAY:
-            return False
-        visited[node] = GRAY
-        for x in G[node]:
-            if visited[node] == BLACK:
-                continue
-            if not go(x):
-                return False
-
-        visited[node] = BLACK
-        return True
-
-    for node in G.keys():
-        if visited[node] == WHITE:
-            if not go(node):
-                return False
-    return True
+    # Returns False if we find a cycle, which is
+    # an edge to a GRAY vertex.
+    labels, offsets, targets = index_graph(G)
+    return dfs(offsets, targets, range(len(labels)),
+               back_edge=lambda u, v: True, stats=stats)
 
 
 # Returns a topological sorting if possible,
 # otherwise, returns a empty list if there is
 # a cycle.
 # O(V + E) time, O(V) space.
-def top_sortable(G):
-    res = []
-    WHITE, GRAY, BLACK = 0, 1, 2
-    visited = {k: WHITE for k in G.keys()}
-
-    def go(node):
-        # Returns False if we find a cycle.
-        if visited[node] == GRAY:
-            return False
-        visited[node] = GRAY
-        for x in G[node]:
-            if visited[node] == BLACK:
-                continue
-            if not go(x):
-                return False
-        visited[node] = BLACK
-        res.append(node)
-        return True
-
-    for node in G.keys():
-        if visited[node] == WHITE:
-            if not go(node):
-                return []
-    return res[::-1]
+def top_sortable(G, stats=None):
+    labels, offsets, targets = index_graph(G)
+    res = array('i')
+    if not dfs(offsets, targets, range(len(labels)),
+               post=res.append, back_edge=lambda u, v: True,
+               stats=stats):
+        return []
+    return [labels[i] for i in reversed(res)]
 
 
 # Given a DAG, returns the length of the
@@ -0,0 +1,136 @@
+'''
+    Maintaining a topological order of a DAG while edges are
+    added and removed, using the algorithm of Pearce and Kelly.
+
+    Rerunning Kahn's algorithm after every insertion costs
+    O(V + E) each time, even though most insertions do not
+    change the order at all.  Keep the position ord[v] of every
+    vertex in the current order.  Removing an edge never breaks
+    the order.  Adding x -> y with ord[x] < ord[y] does not
+    either.  Otherwise only the vertices with positions between
+    ord[y] and ord[x] can be affected:
+
+    - a forward search from y over vertices with position at
+      most ord[x] finds the set F of vertices that must move
+      after x (if it reaches x the new edge closes a cycle and
+      is refused), and
+
+    - a backward search from x over vertices with position at
+      least ord[y] finds the set B that must stay before y.
+
+    The positions held by B and F are then handed out again,
+    first to B and then to F, each in its old relative order.
+    The work is proportional to the edges around the affected
+    region rather than to the whole graph.
+
+    Graphs given as adjacency list.  For example:
+
+    G = {0 : [1,2,3],
+         1 : [],
+         2 : [],
+         3 : []}
+'''
+
+from kahn_top_sort_bottom_up import top_sort
+
+
+class DynamicTopOrder:
+    '''
+    >>> T = DynamicTopOrder({0: [1], 1: [], 2: []})
+    >>> T.order()
+    [0, 2, 1]
+    >>> T.add_edge(1, 2)
+    True
+    >>> T.order()
+    [0, 1, 2]
+    >>> T.add_edge(2, 0)
+    False
+    >>> T.remove_edge(0, 1)
+    >>> T.add_edge(2, 0)
+    True
+    >>> T.order()
+    [1, 2, 0]
+    '''
+
+    def __init__(self, G):
+        order = top_sort(G)
+        if len(order) != len(G.keys()):
+            raise ValueError("G has a cycle")
+        self.out = {v: set(G[v]) for v in G.keys()}
+        self.into = {v: set() for v in G.keys()}
+        for v in G.keys():
+            for w in G[v]:
+                self.into[w].add(v)
+        self.ord = {v: i for i, v in enumerate(order)}
+        self.at = order
+
+    def order(self):
+        return list(self.at)
+
+    def add_vertex(self, v):
+        if v in self.ord:
+            return
+        self.out[v] = set()
+        self.into[v] = set()
+        self.ord[v] = len(self.at)
+        self.at.append(v)
+
+    def remove_edge(self, x, y):
+        self.out[x].discard(y)
+        self.into[y].discard(x)
+
+    def add_edge(self, x, y):
+        '''Adds the edge x -> y and returns True, or returns
+        False (leaving the graph unchanged) if the edge
+        would create a cycle.'''
+        self.add_vertex(x)
+        self.add_vertex(y)
+        pos = self.ord
+        lb, ub = pos[y], pos[x]
+        if lb > ub:
+            self.out[x].add(y)
+            self.into[y].add(x)
+            return True
+        if x == y:
+            return False
+
+        # Forward search from y.
+        F = self._search(y, self.out, lambda v: pos[v] <= ub, x)
+        if F is None:
+            return False
+        # Backward search from x.
+        B = self._search(x, self.into, lambda v: pos[v] >= lb, None)
+
+        self.out[x].add(y)
+        self.into[y].add(x)
+
+        B.sort(key=pos.get)
+        F.sort(key=pos.get)
+        moved = B + F
+        positions = sorted(pos[v] for v in moved)
+        for v, i in zip(moved, positions):
+            pos[v] = i
+            self.at[i] = v
+        return True
+
+    @staticmethod
+    def _search(start, adjacency, inside, stop):
+        '''Returns the vertices reachable from start through
+        vertices satisfying inside, or None if stop is one
+        of them.'''
+        seen = {start}
+        stack = [start]
+        while len(stack) > 0:
+            v = stack.pop()
+            for w in adjacency[v]:
+                if w == stop:
+                    return None
+                if w not in seen and inside(w):
+                    seen.add(w)
+                    stack.append(w)
+        return list(seen)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,130 @@
+'''
+    Running the nodes of a DAG as tasks, using the in-degree
+    bookkeeping of Kahn's algorithm (kahn_top_sort_bottom_up.py).
+
+    A node can run as soon as all of its predecessors have
+    finished, i.e. when its in-degree among the unfinished nodes
+    drops to zero.  Kahn's algorithm removes these nodes one at
+    a time to produce a single list, but for execution we want
+    to know them as early as possible:
+
+    (1) ready_sets yields the nodes level by level: first all
+    nodes of in-degree zero, then every node all of whose
+    predecessors were in earlier sets, and so on.  Each set is
+    an antichain, so its nodes can run in parallel.
+
+    (2) run_tasks runs a callable on every node with a
+    concurrent.futures pool and releases each node the moment
+    its last predecessor finishes, without waiting for the rest
+    of its level.  The wall-clock time then follows the longest
+    (critical) path instead of the sum of the levels.
+
+    Graphs given as adjacency list, with an edge u -> v meaning
+    that u must finish before v starts.  For example:
+
+    G = {0 : [1,2,3],
+        1 : [],
+        2 : [],
+        3 : []}
+'''
+
+import collections
+import concurrent.futures
+
+from kahn_top_sort_bottom_up import top_sort
+
+
+def _in_degrees(G):
+    in_degree = collections.Counter()
+    for v in G.keys():
+        for w in G[v]:
+            in_degree[w] += 1
+    return in_degree
+
+
+# O(V + E) time, O(V) space.
+def ready_sets(G):
+    '''Yields lists of nodes; the nodes of each list only
+    depend on nodes of earlier lists.  Raises ValueError
+    after the last list if G has a cycle.
+
+    >>> list(ready_sets({0: [1, 2], 1: [3], 2: [3], 3: []}))
+    [[0], [1, 2], [3]]
+    '''
+    in_degree = _in_degrees(G)
+    level = [v for v in G.keys() if in_degree[v] == 0]
+    count = 0
+    while len(level) > 0:
+        yield level
+        count += len(level)
+        next_level = []
+        for v in level:
+            for w in G[v]:
+                in_degree[w] -= 1
+                if in_degree[w] == 0:
+                    next_level.append(w)
+        level = next_level
+
+    if count != len(G.keys()):
+        raise ValueError("G has a cycle")
+
+
+def run_tasks(G, task, max_workers=None, executor=None):
+    '''Calls task(v) for every node v of the DAG G, each one
+    after all of its predecessors have returned, and returns
+    a dictionary from nodes to the values returned.
+
+    By default the tasks run on a ThreadPoolExecutor with
+    max_workers threads.  Any other concurrent.futures
+    executor can be passed instead (for example a
+    ProcessPoolExecutor, in which case task must be
+    picklable); then at most max_workers tasks (if given)
+    are submitted at a time.
+
+    Raises ValueError (before running anything) if G has a
+    cycle.  If a task raises, no further tasks are started
+    and the exception is raised once the running ones end.
+
+    >>> run_tasks({0: [1, 2], 1: [3], 2: [3], 3: []}, lambda v: v * v)
+    {0: 0, 1: 1, 2: 4, 3: 9}
+    '''
+    if len(top_sort(G)) != len(G.keys()):
+        raise ValueError("G has a cycle")
+
+    own_executor = executor is None
+    if own_executor:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+        max_workers = None
+
+    in_degree = _in_degrees(G)
+    ready = collections.deque(v for v in G.keys() if in_degree[v] == 0)
+    running = {}
+    results = {}
+    try:
+        while len(ready) > 0 or len(running) > 0:
+            while len(ready) > 0 and (max_workers is None or
+                                      len(running) < max_workers):
+                v = ready.popleft()
+                running[executor.submit(task, v)] = v
+
+            done, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                v = running.pop(future)
+                results[v] = future.result()
+                for w in G[v]:
+                    in_degree[w] -= 1
+                    if in_degree[w] == 0:
+                        ready.append(w)
+    finally:
+        if len(running) > 0:
+            concurrent.futures.wait(running)
+        if own_executor:
+            executor.shutdown()
+
+    return {v: results[v] for v in G.keys()}
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -10,61 +10,74 @@
     accomplishes this in O(V+E) time.
 '''
 
-import collections
+import time
+from array import array
+
+from dfs_engine import WHITE, dfs, index_graph, reverse_graph
 
 # Returns the strongly connected components of G in a
 # topological ordering.
 # O(V + E) time, O(V + E) space.
+#
+# Both passes use the explicit-stack DFS from dfs_engine.py, so
+# deep graphs do not hit the recursion limit, and the reverse
+# graph is built as flat arrays instead of a dictionary of sets.
+#
+# If stats is given (a collections.Counter, say) the DFS counts
+# of both passes are added to it (see dfs_engine.py), and the
+# seconds spent in each phase to its "time index", "time first
+# pass", "time reverse" and "time second pass" entries.
+
+
+def kosaraju(G, stats=None):
+    if stats is not None:
+        start = time.perf_counter()
+    labels, offsets, targets = index_graph(G)
+    if stats is not None:
+        stats["time index"] += time.perf_counter() - start
+    return _kosaraju(labels, offsets, targets, stats)
 
 
-def kosaraju(G):
+# Same as kosaraju but on a CSRGraph (see ShortestPath/csr.py).
+def kosaraju_csr(C, stats=None):
+    return _kosaraju(C.labels, C.offsets, C.targets, stats)
+
+
+def _kosaraju(labels, offsets, targets, stats=None):
+    V = len(labels)
+    if stats is not None:
+        times = [time.perf_counter()]
 
     # Do a "DFS topological sorting" of the nodes of G.
     # Of course G might have edges, so this is not a
     # real toplogical sorting.
-    node_order = []
-    visited = {k: False for k in G.keys()}
-
-    def go(node):
-        if visited[node]:
-            return
-        visited[node] = True
-        for x in G[node]:
-            go(x)
-        node_order.append(node)
-
-    for node in G.keys():
-        go(node)
-    node_order = node_order[::-1]
+    node_order = array('i')
+    dfs(offsets, targets, range(V), post=node_order.append, stats=stats)
+    if stats is not None:
+        times.append(time.perf_counter())
 
     # Reverse the graph.
-    G_reverse = collections.defaultdict(set)
-    for v in G.keys():
-        for w in G[v]:
-            G_reverse[w].add(v)
+    r_offsets, r_targets = reverse_graph(offsets, targets)
+    if stats is not None:
+        times.append(time.perf_counter())
 
     # Explore the reverse graph in the order given from
-    # the "topological sorting".
-    seen = {k: False for k in G.keys()}
-
-    # Return list of nodes reachable from the root
-    # in the reverse graph of G.
-    def reachable(root):
-        ans = []
-
-        def dfs(node):
-            if seen[node]:
-                return
-            ans.append(node)
-            seen[node] = True
-            for v in G_reverse[node]:
-                dfs(v)
-
-        dfs(root)
-        return ans
-
+    # the "topological sorting".  The nodes reachable from
+    # each new root in the reverse graph form a component.
+    seen = bytearray(V)
     res = []
-    for node in node_order:
-        if not seen[node]:
-            res.append(reachable(node))
+    for i in range(V - 1, -1, -1):
+        root = node_order[i]
+        if seen[root] != WHITE:
+            continue
+        component = []
+        dfs(r_offsets, r_targets, (root,), seen,
+            pre=lambda v: component.append(labels[v]), stats=stats)
+        res.append(component)
+
+    if stats is not None:
+        times.append(time.perf_counter())
+        for phase, start, end in zip(("first pass", "reverse",
+                                      "second pass"), times, times[1:]):
+            stats["time " + phase] += end - start
     return res
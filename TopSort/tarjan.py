@@ -0,0 +1,175 @@
+'''
+    One-pass strongly connected components, using Pearce's
+    memory-efficient variant of Tarjan's algorithm.
+
+    Kosaraju's algorithm (kosaraju.py) does two DFS passes and
+    needs the reverse of the input graph.  Tarjan's algorithm
+    does one DFS: each vertex gets a DFS number, and rindex[v]
+    is lowered to the smallest number reachable from v through
+    vertices whose component is not yet known.  A vertex whose
+    rindex is still its own DFS number when it finishes is the
+    root of a component, made up of it and the vertices pushed
+    on the component stack S after it.
+
+    Pearce's version keeps the DFS numbers and the component
+    ids in the same array (ids are handed out from V - 1 down,
+    and are always larger than any live DFS number), so besides
+    the graph the memory is one integer array, one bit per
+    vertex and the stacks.  The DFS uses an explicit stack, as
+    in dfs_engine.py.
+
+    Components are finished sinks first, so numbering them in
+    reverse gives ids in a topological order of the
+    condensation, the same order kosaraju returns them in.
+
+    Graphs given as adjacency list.  For example:
+
+    G = {0 : [1],
+         1 : [2],
+         2 : [0, 3],
+         3 : []}
+'''
+
+from array import array
+
+from dfs_engine import index_graph
+
+
+# O(V + E) time, O(V) space.
+def scc(offsets, targets):
+    '''Returns (number of components, comp) for the graph
+    on 0, ..., V - 1 given by offsets and targets (see
+    dfs_engine.py).  comp[v] is the id of the component of
+    v; every edge u -> v has comp[u] <= comp[v].'''
+    V = len(offsets) - 1
+    rindex = array('q', bytes(8 * V))
+    is_root = bytearray(V)
+    S = []
+    index = 1
+    c = V - 1
+
+    for r in range(V):
+        if rindex[r] != 0:
+            continue
+        rindex[r] = index
+        index += 1
+        is_root[r] = 1
+
+        stack = []
+        u = r
+        k = offsets[u]
+        end = offsets[u + 1]
+        while True:
+            while k < end:
+                w = targets[k]
+                k += 1
+                if rindex[w] == 0:
+                    stack.append((u, k, end))
+                    rindex[w] = index
+                    index += 1
+                    is_root[w] = 1
+                    u = w
+                    k = offsets[w]
+                    end = offsets[w + 1]
+                elif rindex[w] < rindex[u]:
+                    rindex[u] = rindex[w]
+                    is_root[u] = 0
+
+            # u is finished.
+            if is_root[u]:
+                index -= 1
+                while len(S) > 0 and rindex[u] <= rindex[S[-1]]:
+                    rindex[S.pop()] = c
+                    index -= 1
+                rindex[u] = c
+                c -= 1
+            else:
+                S.append(u)
+
+            if len(stack) == 0:
+                break
+            child = u
+            u, k, end = stack.pop()
+            if rindex[child] < rindex[u]:
+                rindex[u] = rindex[child]
+                is_root[u] = 0
+
+    # Component ids were handed out V - 1, V - 2, ... as the
+    # components finished; renumber so the first is num - 1.
+    num = V - 1 - c
+    comp = array('i', bytes(4 * V))
+    for v in range(V):
+        comp[v] = rindex[v] - c - 1
+    return num, comp
+
+
+# O(V + E) time, O(V + E) space.
+def condensation(offsets, targets, num, comp):
+    '''Returns (offsets, targets) of the condensation DAG on
+    the component ids 0, ..., num - 1, without repeated
+    edges or self-loops.'''
+    V = len(offsets) - 1
+
+    # Group the vertices by component (counting sort).
+    start = array('q', bytes(8 * (num + 1)))
+    for v in range(V):
+        start[comp[v] + 1] += 1
+    for a in range(num):
+        start[a + 1] += start[a]
+    members = array('i', bytes(4 * V))
+    nxt = array('q', start[:num])
+    for v in range(V):
+        members[nxt[comp[v]]] = v
+        nxt[comp[v]] += 1
+
+    dag_offsets = array('q', [0])
+    dag_targets = array('i')
+    # last[b] == a + 1 if the edge a -> b is already added.
+    last = array('i', bytes(4 * num))
+    for a in range(num):
+        for i in range(start[a], start[a + 1]):
+            v = members[i]
+            for k in range(offsets[v], offsets[v + 1]):
+                b = comp[targets[k]]
+                if b != a and last[b] != a + 1:
+                    last[b] = a + 1
+                    dag_targets.append(b)
+        dag_offsets.append(len(dag_targets))
+    return dag_offsets, dag_targets
+
+
+def tarjan(G):
+    '''Returns (labels, comp, dag) where comp[i] is the
+    component id of the vertex labels[i], and dag is the
+    (offsets, targets) pair of the condensation.  The ids
+    are in topological order.
+
+    >>> labels, comp, dag = tarjan({0: [1], 1: [2], 2: [0, 3], 3: []})
+    >>> list(comp)
+    [0, 0, 0, 1]
+    >>> [list(a) for a in dag]
+    [[0, 1, 1], [1]]
+    '''
+    labels, offsets, targets = index_graph(G)
+    num, comp = scc(offsets, targets)
+    return labels, comp, condensation(offsets, targets, num, comp)
+
+
+# Same as tarjan but on a CSRGraph (see ShortestPath/csr.py).
+def tarjan_csr(C):
+    num, comp = scc(C.offsets, C.targets)
+    return comp, condensation(C.offsets, C.targets, num, comp)
+
+
+def components(labels, comp):
+    '''Turns a component id array into the list of
+    components (lists of labels) returned by kosaraju.'''
+    res = [[] for _ in range(max(comp, default=-1) + 1)]
+    for i, a in enumerate(comp):
+        res[a].append(labels[i])
+    return res
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
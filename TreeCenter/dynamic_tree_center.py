@@ -0,0 +1,147 @@
+'''
+    Keeping the diameter and center(s) of a tree up to date as
+    leaves are attached, instead of calling get_centers again.
+
+    If (a, b) are the endpoints of a diameter of length D and a
+    new leaf x is attached, then some diameter of the new tree
+    is (a, b), (a, x) or (b, x): the farthest vertex from x is
+    always one of a and b.  So an insertion needs only the two
+    distances d(x, a) and d(x, b).
+
+    Distances come from lowest common ancestors,
+
+        d(u, v) = depth[u] + depth[v] - 2 depth[lca(u, v)],
+
+    found by binary lifting: jump[j][v] is the ancestor of v
+    2^j levels up (the root for jumps past it), so any ancestor
+    is reached in O(log n) jumps.  A new leaf fills in its own
+    column of the table from its parent's, and a new level is
+    added to the table when the depth of the tree first
+    reaches the next power of two.
+
+    The centers are the middle vertex (D even) or the two
+    middle vertices (D odd) of the path from a to b, found by
+    walking up from a or b, again by jumps.
+
+    O(log n) time per insertion (amortized, the new levels cost
+    O(n) each but there are only log(n) of them), O(n log n)
+    space.
+
+    Trees given as in treeCenter.py: N vertices labeled
+    0, ..., N - 1 and a list of edges [[u, v], ...].
+'''
+
+from array import array
+
+from tree_engine import Tree
+
+
+class DynamicTreeCenter:
+    '''
+    >>> T = DynamicTreeCenter(3, [[0, 1], [1, 2]])
+    >>> T.centers, T.endpoints
+    ([1], (0, 2))
+    >>> T.add_leaf(2)
+    3
+    >>> T.centers, T.diameter
+    ([1, 2], 3)
+    >>> T.add_leaf(0), T.distance(3, 4)
+    (4, 4)
+    >>> T.centers
+    [1]
+    '''
+
+    def __init__(self, N=1, edges=()):
+        tree = Tree(N, edges)
+        self.parent = tree.parent
+        self.depth = array('i', [0]) * N
+        for v in tree.order[1:]:
+            self.depth[v] = self.depth[self.parent[v]] + 1
+
+        # The root is its own parent in the jump table.
+        first = array('i', self.parent)
+        first[tree.root] = tree.root
+        self.jump = [first]
+        while 1 << len(self.jump) <= max(self.depth):
+            self._add_level()
+
+        self.diameter = tree.diameter
+        self.endpoints = tree.endpoints
+        self._update_centers()
+
+    def __len__(self):
+        return len(self.depth)
+
+    def _add_level(self):
+        prev = self.jump[-1]
+        self.jump.append(array('i', (prev[prev[v]] for v in range(len(self)))))
+
+    def ancestor(self, v, k):
+        '''Returns the ancestor k levels above v.'''
+        j = 0
+        while k > 0:
+            if k & 1:
+                v = self.jump[j][v]
+            k >>= 1
+            j += 1
+        return v
+
+    def lca(self, u, v):
+        depth = self.depth
+        if depth[u] < depth[v]:
+            u, v = v, u
+        u = self.ancestor(u, depth[u] - depth[v])
+        if u == v:
+            return u
+        for jump in reversed(self.jump):
+            if jump[u] != jump[v]:
+                u = jump[u]
+                v = jump[v]
+        return self.jump[0][u]
+
+    def distance(self, u, v):
+        depth = self.depth
+        return depth[u] + depth[v] - 2 * depth[self.lca(u, v)]
+
+    def _on_path(self, a, b, k):
+        '''Returns the vertex k steps from a on the path to b.'''
+        c = self.lca(a, b)
+        up = self.depth[a] - self.depth[c]
+        if k <= up:
+            return self.ancestor(a, k)
+        return self.ancestor(b, up + self.depth[b] - self.depth[c] - k)
+
+    def _update_centers(self):
+        a, b = self.endpoints
+        D = self.diameter
+        centers = [self._on_path(a, b, D // 2)]
+        if D % 2 == 1:
+            centers.append(self._on_path(a, b, D // 2 + 1))
+        self.centers = sorted(centers)
+
+    def add_leaf(self, p):
+        '''Attaches a new leaf to p and returns it.'''
+        x = len(self)
+        self.depth.append(self.depth[p] + 1)
+        self.parent.append(p)
+        self.jump[0].append(p)
+        for j in range(1, len(self.jump)):
+            self.jump[j].append(self.jump[j - 1][self.jump[j - 1][x]])
+        if 1 << len(self.jump) <= self.depth[x]:
+            self._add_level()
+
+        a, b = self.endpoints
+        da = self.distance(x, a)
+        db = self.distance(x, b)
+        if da > self.diameter and da >= db:
+            self.diameter, self.endpoints = da, (a, x)
+            self._update_centers()
+        elif db > self.diameter:
+            self.diameter, self.endpoints = db, (x, b)
+            self._update_centers()
+        return x
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,147 @@
+'''
+    The centers of many trees at once, with NumPy.
+
+    Calling getCenters or get_centers (treeCenter.py) once per
+    tree spends most of the time setting up each call when the
+    trees are small.  Here a whole forest is one flat encoding:
+
+    - offsets: tree i has the vertices offsets[i], ...,
+      offsets[i + 1] - 1 of the forest, labeled 0, ...,
+      offsets[i + 1] - offsets[i] - 1 within the tree;
+
+    - src, dst: the edges of all the trees, tree after tree,
+      with labels within the tree.  Tree i has one edge fewer
+      than vertices, so its edges are the rows
+      offsets[i] - i, ..., offsets[i + 1] - i - 2.
+
+    The leaves of all the trees are pruned together, layer by
+    layer, as in getCenters, until every tree has at most two
+    vertices left.  Instead of adjacency sets each vertex keeps
+    its degree and the XOR of its neighbours; when v is a leaf
+    that XOR is its only neighbour.  A round updates the
+    neighbours of the current frontier of leaves with ufunc.at,
+    and the new frontier is those neighbours whose degree fell
+    to 1, in the trees that still have more than two vertices.
+
+    O(V) work over O(max radius) rounds of NumPy calls.
+
+    forest_centers can split the forest into ranges of trees
+    handled by a process pool.
+'''
+
+import concurrent.futures
+import os
+
+import numpy as np
+
+
+def encode_forest(trees):
+    '''Returns (src, dst, offsets) for a list of trees
+    (N, edges) given as in treeCenter.py.
+
+    >>> src, dst, offsets = encode_forest([(2, [[0, 1]]), (1, [])])
+    >>> src.tolist(), dst.tolist(), offsets.tolist()
+    ([0], [1], [0, 2, 3])
+    '''
+    offsets = np.zeros(len(trees) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([N for N, _ in trees])
+    edges = np.array([e for _, edges in trees for e in edges],
+                     dtype=np.int64).reshape(-1, 2)
+    return edges[:, 0].copy(), edges[:, 1].copy(), offsets
+
+
+def _centers(src, dst, offsets):
+    offsets = np.asarray(offsets, dtype=np.int64)
+    T = len(offsets) - 1
+    V = int(offsets[-1])
+    sizes = np.diff(offsets)
+
+    tree = np.repeat(np.arange(T), sizes)
+    base = np.repeat(offsets[:-1], np.maximum(sizes - 1, 0))
+    u = np.asarray(src, dtype=np.int64) + base
+    v = np.asarray(dst, dtype=np.int64) + base
+
+    degree = np.bincount(u, minlength=V) + np.bincount(v, minlength=V)
+    xor = np.zeros(V, dtype=np.int64)
+    np.bitwise_xor.at(xor, u, v)
+    np.bitwise_xor.at(xor, v, u)
+
+    alive = np.ones(V, dtype=bool)
+    remaining = sizes.copy()
+    leaves = np.flatnonzero(degree == 1)
+    leaves = leaves[remaining[tree[leaves]] > 2]
+
+    while len(leaves) > 0:
+        alive[leaves] = False
+        remaining -= np.bincount(tree[leaves], minlength=T)
+        neighbors = xor[leaves]
+        np.bitwise_xor.at(xor, neighbors, leaves)
+        np.subtract.at(degree, neighbors, 1)
+        leaves = neighbors[(degree[neighbors] == 1)
+                           & (remaining[tree[neighbors]] > 2)]
+        # A vertex appears once per leaf it lost in this round.
+        leaves.sort()
+        leaves = leaves[np.diff(leaves, prepend=-1) != 0]
+
+    # The one or two vertices left in each tree, in order.
+    left = np.flatnonzero(alive)
+    starts = np.zeros(T + 1, dtype=np.int64)
+    starts[1:] = np.cumsum(remaining)
+    first = left[starts[:-1]] - offsets[:-1]
+    second = np.full(T, -1, dtype=np.int64)
+    two = remaining == 2
+    second[two] = left[starts[:-1][two] + 1] - offsets[:-1][two]
+    return first, second
+
+
+def _centers_range(src, dst, offsets):
+    return _centers(src, dst, offsets - offsets[0])
+
+
+def forest_centers(src, dst, offsets, processes=None,
+                   trees_per_task=1 << 14):
+    '''Returns (first, second): the (first) center of tree i
+    is first[i], and its second center second[i], or -1 if
+    it has only one.
+
+    processes is the number of worker processes (the number
+    of CPUs if None); each task handles trees_per_task trees,
+    and a forest of at most that many trees (or processes=1)
+    is done in this process.
+
+    >>> src, dst, offsets = encode_forest(
+    ...     [(4, [[0, 1], [1, 2], [2, 3]]), (4, [[0, 1], [0, 2], [0, 3]]),
+    ...      (1, [])])
+    >>> first, second = forest_centers(src, dst, offsets)
+    >>> first.tolist(), second.tolist()
+    ([1, 0, 0], [2, -1, -1])
+    '''
+    offsets = np.asarray(offsets, dtype=np.int64)
+    T = len(offsets) - 1
+    if processes == 1 or T <= trees_per_task:
+        return _centers(src, dst, offsets)
+
+    # Tree i has its edges from offsets[i] - i.
+    edge_offsets = offsets - np.arange(T + 1)
+    tasks = []
+    for lo in range(0, T, trees_per_task):
+        hi = min(lo + trees_per_task, T)
+        a, b = edge_offsets[lo], edge_offsets[hi]
+        tasks.append((src[a:b], dst[a:b], offsets[lo:hi + 1]))
+
+    with concurrent.futures.ProcessPoolExecutor(
+            processes or os.cpu_count()) as pool:
+        parts = list(pool.map(_centers_range, *zip(*tasks)))
+    return (np.concatenate([first for first, _ in parts]),
+            np.concatenate([second for _, second in parts]))
+
+
+def centers_list(first, second):
+    '''The centers of each tree as lists, as getCenters returns.'''
+    return [[a] if b < 0 else [a, b]
+            for a, b in zip(first.tolist(), second.tolist())]
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
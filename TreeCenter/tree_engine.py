@@ -0,0 +1,181 @@
+'''
+    Everything about a tree at once: the eccentricity of every
+    vertex, the diameter and its endpoints, the radius, the
+    center(s) and the centroid(s).
+
+    The tree is stored once as flat arrays: the parent of every
+    vertex, an order in which every vertex comes after its
+    parent, and the children of each vertex v as the slice
+
+        children[child_offsets[v]:child_offsets[v + 1]]
+
+    No adjacency lists, per-vertex sets or dictionaries are
+    built.  The parents are found by pruning leaves while
+    keeping, for every vertex, its degree and the XOR of its
+    neighbours: once v is a leaf that XOR is its only remaining
+    neighbour, i.e. its parent.  Reversing the pruning order
+    gives the order from the root.
+
+    The eccentricities come from a rerooting DP over that
+    order.  Going up the tree (in reverse), down1[v] and
+    down2[v] are the two longest downward paths from v through
+    different children.  Going down the tree, up[c]
+    is the longest path from c that starts with the edge to its
+    parent p: one more than the longer of up[p] and the longest
+    downward path from p that does not go through c (down1[p],
+    or down2[p] if down1[p] goes through c).  The eccentricity
+    of v is max(down1[v], up[v]).  The far end of each of these
+    paths is carried along, which gives the diameter endpoints.
+
+    The radius is the smallest eccentricity and the centers
+    are the (one or two) vertices attaining it.  The centroids
+    are the (one or two) vertices whose removal leaves no part
+    with more than N / 2 vertices, found from subtree sizes.
+
+    O(N) time, O(N) space.
+
+    Trees given as in treeCenter.py: N vertices labeled
+    0, ..., N - 1 and a list of edges [[u, v], ...].
+'''
+
+import itertools
+from array import array
+
+
+class Tree:
+    '''
+    >>> T = Tree(6, [[0, 1], [1, 2], [2, 3], [3, 4], [2, 5]])
+    >>> list(T.eccentricity)
+    [4, 3, 2, 3, 4, 3]
+    >>> T.diameter, T.endpoints, T.radius
+    (4, (0, 4), 2)
+    >>> T.centers, T.centroids
+    ([2], [2])
+    '''
+
+    def __init__(self, N, edges, root=0):
+        self.N = N
+        self.root = root
+        if len(edges) != N - 1:
+            raise ValueError("edges do not form a tree")
+
+        degree = [0] * N
+        xor = [0] * N
+        for u, v in edges:
+            degree[u] += 1
+            degree[v] += 1
+            xor[u] ^= v
+            xor[v] ^= u
+
+        parent = [-1] * N
+        pruned = []
+        # The root is never pruned.
+        leaves = [v for v in range(N) if degree[v] == 1 and v != root]
+        while len(leaves) > 0:
+            v = leaves.pop()
+            pruned.append(v)
+            p = xor[v]
+            parent[v] = p
+            xor[p] ^= v
+            degree[p] -= 1
+            if degree[p] == 1 and p != root:
+                leaves.append(p)
+        if len(pruned) != N - 1:
+            raise ValueError("edges do not form a tree")
+
+        pruned.append(root)
+        pruned.reverse()
+        self.parent = array('i', parent)
+        self.order = array('i', pruned)
+
+        # Children grouped by parent (counting sort).
+        count = [0] * (N + 1)
+        for v in pruned[1:]:
+            count[parent[v] + 1] += 1
+        offsets = list(itertools.accumulate(count))
+        fill = offsets[:N]
+        children = [0] * (N - 1)
+        for v in pruned[1:]:
+            p = parent[v]
+            children[fill[p]] = v
+            fill[p] += 1
+        self.child_offsets = array('q', offsets)
+        self.children = array('i', children)
+
+        self._analyze(parent, pruned)
+
+    def children_of(self, v):
+        return self.children[self.child_offsets[v]:self.child_offsets[v + 1]]
+
+    def _analyze(self, parent, order):
+        N = self.N
+
+        # Up the tree: longest and second longest downward paths,
+        # their far ends, and the child the longest one goes to.
+        down1 = [0] * N
+        down2 = [0] * N
+        far1 = list(range(N))
+        far2 = list(range(N))
+        best = [-1] * N
+        size = [1] * N
+        heaviest = [0] * N
+        for i in range(N - 1, 0, -1):
+            v = order[i]
+            p = parent[v]
+            size[p] += size[v]
+            if size[v] > heaviest[p]:
+                heaviest[p] = size[v]
+            h = down1[v] + 1
+            if h > down1[p]:
+                down2[p] = down1[p]
+                far2[p] = far1[p]
+                down1[p] = h
+                far1[p] = far1[v]
+                best[p] = v
+            elif h > down2[p]:
+                down2[p] = h
+                far2[p] = far1[v]
+
+        # Down the tree: longest paths starting with the edge up.
+        up = [0] * N
+        far_up = list(range(N))
+        for i in range(1, N):
+            c = order[i]
+            p = parent[c]
+            if best[p] == c:
+                h, far = down2[p], far2[p]
+            else:
+                h, far = down1[p], far1[p]
+            if up[p] > h:
+                h, far = up[p], far_up[p]
+            up[c] = h + 1
+            far_up[c] = far
+
+        ecc = array('i', map(max, down1, up))
+        self.eccentricity = ecc
+        self.size = array('i', size)
+
+        self.diameter = max(ecc)
+        a = ecc.index(self.diameter)
+        self.endpoints = (a, far1[a] if down1[a] >= up[a] else far_up[a])
+
+        self.radius = min(ecc)
+        self.centers = [v for v in range(N) if ecc[v] == self.radius]
+
+        # The largest part left after removing v.
+        self.centroids = [v for v in range(N)
+                          if 2 * max(heaviest[v], N - size[v]) <= N]
+
+
+def tree_centers(N, edges):
+    '''Same as get_centers in treeCenter.py (in increasing order).
+
+    >>> tree_centers(4, [[0,1],[1,2],[2,3]])
+    [1, 2]
+    '''
+    return Tree(N, edges).centers
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()